@@ -35,6 +35,7 @@ University of Notre Dame
 """
 
 from __future__ import annotations
+import functools
 import os
 from typing import Optional
 
@@ -348,6 +349,7 @@ def orbitals_coul_filename(postfix):
     # don't make the Coulomb orbital filename dependent on postfix
     return _orbitals_coul_filename_template.format("")
 
+@functools.lru_cache(maxsize=None)
 def orbitals_filename(postfix):
     """Construct filename for target basis orbitals.
 
@@ -377,6 +379,7 @@ def radial_me_filename(postfix, operator_type, power):
     """
     return _radial_me_filename_template.format(operator_type, power, postfix)
 
+@functools.lru_cache(maxsize=None)
 def obme_filename(postfix, id):
     """Construct filename for one-body matrix elements.
 
@@ -100,6 +100,13 @@ from . import (
     utils,
 )
 
+# mfdn.res sanity check patterns
+k_negative_dimension_regex = re.compile(r"dimension.*=.*(-[0-9]+)")
+k_negative_numnonzero_regex = re.compile(r"numnonzero.*=.*(-[0-9]+)")
+
+# partitioning lines to carry over into mfdn_smwf.info (numbers and whitespace only)
+k_nonnumeric_regex = re.compile(r"[^0-9\s]")
+
 
 def set_up_Nmax_truncation(task, inputlist):
     """Generate Nmax truncation inputs for MFDn v15.
@@ -393,14 +400,12 @@ def run_mfdn(task, postfix=""):
 
     # check for basic sanity of dimension and numnonzero
     with open("mfdn.res", "r") as res:
-        neg_dim_regex = re.compile(r"dimension.*=.*(-[0-9]+)")
-        neg_nnz_regex = re.compile(r"numnonzero.*=.*(-[0-9]+)")
         for line in res:
-            if match := neg_dim_regex.match(line):
+            if match := k_negative_dimension_regex.match(line):
                 raise mcscript.exception.ScriptError(
                     f"negative MFDn dimension: {match.group(1)}"
                 )
-            if match := neg_nnz_regex.match(line):
+            if match := k_negative_numnonzero_regex.match(line):
                 raise mcscript.exception.ScriptError(
                     f"negative MFDn numnonzero: {match.group(1)}"
                 )
@@ -752,7 +757,6 @@ def generate_smwf_info(task, orbital_filename, partitioning_filename, res_filena
     """
 
     import mfdnres
-    import re
 
     lines = []
     lines.append("   15200    ! Version Number")
@@ -771,8 +775,8 @@ def generate_smwf_info(task, orbital_filename, partitioning_filename, res_filena
         [
             environ.shell_filename("orbital-gen"),
             "--convert",
-            "15099", "{:s}".format(orbital_filename),
-            "15200", "{:s}".format(orbital_filename+"15200"),
+            "15099", orbital_filename,
+            "15200", orbital_filename+"15200",
         ],
         mode=mcscript.control.CallMode.kSerial
     )
@@ -796,7 +800,7 @@ def generate_smwf_info(task, orbital_filename, partitioning_filename, res_filena
     with open(partitioning_filename) as partitioning_fp:
         for line in partitioning_fp:
             # ignore lines containing anything other than numbers and whitespace
-            if not re.search(r"[^0-9\s]", line):
+            if not k_nonnumeric_regex.search(line):
                 lines.append(line.rstrip())
 
     # blank line
@@ -16,7 +16,7 @@ defines the one-body source type:
 
     "linear-combination": CoefficientDict({"a": c_a, "b": c_b, ...})
 
-    "tensor-product": [factor_a_id, factor_b_id]
+    "tensor-product": (factor_a_id, factor_b_id)
 
 Supporting information is provided by the supplementary items:
 
@@ -70,7 +70,7 @@ University of Notre Dame
 - 01/30/23 (pjf): Rename j0->J0 and tz0->Tz0.
 
 """
-import collections
+import itertools
 import math
 import re
 
@@ -95,10 +95,10 @@ k_kinematic_operators = {
     "r.r":      {"builtin": "kinematic", "qn": (0,0,0)},
     "ik":       {"builtin": "kinematic", "qn": (1,1,0)},
     "ik.ik":    {"builtin": "kinematic", "qn": (0,0,0)},
-    "rtz":      {"tensor-product": ["r","tz"], "qn": (1,1,0)},
-    "r.rtz":    {"tensor-product": ["r.r","tz"], "qn": (0,0,0)},
-    "iktz":     {"tensor-product": ["ik","tz"], "qn": (1,1,0)},
-    "ik.iktz":  {"tensor-product": ["ik.ik","tz"], "qn": (0,0,0)},
+    "rtz":      {"tensor-product": ("r","tz"), "qn": (1,1,0)},
+    "r.rtz":    {"tensor-product": ("r.r","tz"), "qn": (0,0,0)},
+    "iktz":     {"tensor-product": ("ik","tz"), "qn": (1,1,0)},
+    "ik.iktz":  {"tensor-product": ("ik.ik","tz"), "qn": (0,0,0)},
 }
 
 ################################################################
@@ -112,12 +112,12 @@ k_am_operators = {
     "l2": {"builtin": "am", "qn": (1,0,0)},
     "s":  {"builtin": "am", "qn": (1,0,0)},
     "s2": {"builtin": "am", "qn": (1,0,0)},
-    "ltz": {"tensor-product": ["l", "tz"], "qn": (1,0,0)},
-    "stz": {"tensor-product": ["s", "tz"], "qn": (1,0,0)},
-    "sp": {"tensor-product": ["delta_p", "s"], "qn": (1,0,0)},
-    "sn": {"tensor-product": ["delta_n", "s"], "qn": (1,0,0)},
-    "sp2": {"tensor-product": ["delta_p", "s2"], "qn": (0,0,0)},
-    "sn2": {"tensor-product": ["delta_n", "s2"], "qn": (0,0,0)},
+    "ltz": {"tensor-product": ("l", "tz"), "qn": (1,0,0)},
+    "stz": {"tensor-product": ("s", "tz"), "qn": (1,0,0)},
+    "sp": {"tensor-product": ("delta_p", "s"), "qn": (1,0,0)},
+    "sn": {"tensor-product": ("delta_n", "s"), "qn": (1,0,0)},
+    "sp2": {"tensor-product": ("delta_p", "s2"), "qn": (0,0,0)},
+    "sn2": {"tensor-product": ("delta_n", "s2"), "qn": (0,0,0)},
 }
 
 ################################################################
@@ -139,6 +139,8 @@ k_ladder_operators_native = {
     "c-": {"builtin": "ladder", "qn": (1,1,0)},
 }
 
+k_ladder_operator_ids_generic = {"c+", "c"}
+
 def ladder_operators_generic(hw):
     """Generate ladder operator source info for generic basis.
 
@@ -167,9 +169,73 @@ def ladder_operators_generic(hw):
 
     return sources
 
+################################################################
+# source dependencies
+################################################################
+def source_dependencies(source):
+    """Get ids of sources on which a given source depends.
+
+    Arguments:
+        source (dict): source dictionary
+
+    Returns:
+        (iterable of str): ids of sources used as inputs
+    """
+    if source.get("linear-combination"):
+        return source["linear-combination"].keys()
+    elif source.get("tensor-product"):
+        return source["tensor-product"]
+    else:
+        return []
+
+def get_dependency_graph(sources, targets):
+    """Construct dependency graph over sources reachable from targets.
+
+    Arguments:
+        sources (dict): id to source mapping
+        targets (set): set of targets to generate
+
+    Returns:
+        (dict): id to dependency ids mapping, for reachable sources only
+    """
+    dependency_graph = {}
+    pending_ids = list(targets)
+    while pending_ids:
+        source_id = pending_ids.pop()
+        if source_id in dependency_graph:
+            continue
+        dependencies = source_dependencies(sources[source_id])
+        dependency_graph[source_id] = dependencies
+        pending_ids.extend(dependencies)
+
+    return dependency_graph
+
+def sort_sources(sources, targets):
+    """Extract minimal set of sources needed for targets.
+
+    Arguments:
+        sources (dict): id to source mapping
+        targets (set): set of targets to generate
+
+    Returns:
+        (dict of dict): id to source mapping, sorted in reverse
+            topological order
+    """
+    dependency_graph = get_dependency_graph(sources, targets)
+    sorted_sources = {}
+    for id_ in reversed(mcscript.utils.topological_sort(dependency_graph, targets)):
+        sorted_sources[id_] = sources[id_]
+
+    return sorted_sources
+
 ################################################################
 # solid harmonic operators
 ################################################################
+
+# ids for solid harmonics ("r2Y2") and isovector solid harmonics ("r2Y2tz")
+k_solid_harmonic_re = re.compile(r"(r|ik)([0-9]+)Y([0-9]+)")
+k_iv_solid_harmonic_re = re.compile(r"(r|ik)([0-9]+)Y([0-9]+)tz")
+
 def solid_harmonic_source(coordinate, order, J0=None):
     """Generate solid harmonic source info.
 
@@ -204,6 +270,10 @@ k_h2mixer_builtin = {
     "tz",
 }
 
+# general electric ("E2") and magnetic ("M1") observable set names
+k_electric_observable_set_re = re.compile(r"E([0-9]+)")
+k_magnetic_observable_set_re = re.compile(r"M([0-9]+)")
+
 ################################################################
 # obme sources
 ################################################################
@@ -223,11 +293,11 @@ def generate_ob_observable_sets(task):
             ]
             obme_sources["r.r"] = k_kinematic_operators["r.r"]
             obme_sources["E0p"] = {
-                "tensor-product": ["delta_p", "r.r"],
+                "tensor-product": ("delta_p", "r.r"),
                 "qn": qn
             }
             obme_sources["E0n"] = {
-                "tensor-product": ["delta_n", "r.r"],
+                "tensor-product": ("delta_n", "r.r"),
                 "qn": qn
             }
             continue
@@ -257,7 +327,7 @@ def generate_ob_observable_sets(task):
             continue
 
         # electric transitions (general)
-        match = re.fullmatch(r"E([0-9]+)", name)
+        match = k_electric_observable_set_re.fullmatch(name)
         if match:
             order = int(match.group(1))
             qn = (order,order%2,0)
@@ -268,11 +338,11 @@ def generate_ob_observable_sets(task):
             ]
             solid_harmonic_id = "r{:d}Y{:d}".format(order, J0)
             obme_sources["E{}p".format(order)] = {
-                "tensor-product": ["delta_p", solid_harmonic_id],
+                "tensor-product": ("delta_p", solid_harmonic_id),
                 "qn": qn
             }
             obme_sources["E{}n".format(order)] = {
-                "tensor-product": ["delta_n", solid_harmonic_id],
+                "tensor-product": ("delta_n", solid_harmonic_id),
                 "qn": qn
             }
 
@@ -290,16 +360,16 @@ def generate_ob_observable_sets(task):
             obme_sources["l"] = k_am_operators["l"]
             obme_sources["s"] = k_am_operators["s"]
             obme_sources["Dlp"] = {
-                "tensor-product": ["delta_p", "l"], "coefficient": coefficient, "qn": qn
+                "tensor-product": ("delta_p", "l"), "coefficient": coefficient, "qn": qn
             }
             obme_sources["Dln"] = {
-                "tensor-product": ["delta_n", "l"], "coefficient": coefficient, "qn": qn
+                "tensor-product": ("delta_n", "l"), "coefficient": coefficient, "qn": qn
             }
             obme_sources["Dsp"] = {
-                "tensor-product": ["delta_p", "s"], "coefficient": coefficient, "qn": qn
+                "tensor-product": ("delta_p", "s"), "coefficient": coefficient, "qn": qn
             }
             obme_sources["Dsn"] = {
-                "tensor-product": ["delta_n", "s"], "coefficient": coefficient, "qn": qn
+                "tensor-product": ("delta_n", "s"), "coefficient": coefficient, "qn": qn
             }
             obme_sources["M1"] = {
                 "linear-combination": {
@@ -313,7 +383,7 @@ def generate_ob_observable_sets(task):
             continue
 
         # magnetic transitions (general)
-        match = re.fullmatch(r"M([0-9]+)", name)
+        match = k_magnetic_observable_set_re.fullmatch(name)
         if match:
             order = int(match.group(1))
             J0 = order
@@ -333,28 +403,28 @@ def generate_ob_observable_sets(task):
             obme_sources["s"] = k_am_operators["s"]
             solid_harmonic_id = "r{:d}Y{:d}".format(order-1, J0-1)
             obme_sources["l"+solid_harmonic_id] = {
-                "tensor-product": ["l", solid_harmonic_id], "qn": qn
+                "tensor-product": ("l", solid_harmonic_id), "qn": qn
             }
             obme_sources["s"+solid_harmonic_id] = {
-                "tensor-product": ["s", solid_harmonic_id], "qn": qn
+                "tensor-product": ("s", solid_harmonic_id), "qn": qn
             }
             obme_sources["M{}lp".format(order)] = {
-                "tensor-product": ["delta_p", "l"+solid_harmonic_id],
+                "tensor-product": ("delta_p", "l"+solid_harmonic_id),
                 "coefficient": l_coefficient,
                 "qn": qn
             }
             obme_sources["M{}ln".format(order)] = {
-                "tensor-product": ["delta_n", "l"+solid_harmonic_id],
+                "tensor-product": ("delta_n", "l"+solid_harmonic_id),
                 "coefficient": l_coefficient,
                 "qn": qn
             }
             obme_sources["M{}sp".format(order)] = {
-                "tensor-product": ["delta_p", "s"+solid_harmonic_id],
+                "tensor-product": ("delta_p", "s"+solid_harmonic_id),
                 "coefficient": s_coefficient,
                 "qn": qn
             }
             obme_sources["M{}sn".format(order)] = {
-                "tensor-product": ["delta_n", "s"+solid_harmonic_id],
+                "tensor-product": ("delta_n", "s"+solid_harmonic_id),
                 "coefficient": s_coefficient,
                 "qn": qn
             }
@@ -390,9 +460,9 @@ def generate_ob_observable_sets(task):
             # is used with the standard equation for one-body operators (Suhonen
             # 4.25) rather than the (oddly beta-decay-specific) conventional
             # equation Suhonen 7.19
-            obme_sources["GT+"] = {"tensor-product": ["s", "t+"], "coefficient": 2.0, "qn": (1,0,+1)}
+            obme_sources["GT+"] = {"tensor-product": ("s", "t+"), "coefficient": 2.0, "qn": (1,0,+1)}
             # we define GT- with a negative phase so that GT- = (-1)^Tz0 GT+
-            obme_sources["GT-"] = {"tensor-product": ["s", "t-"], "coefficient": -2.0, "qn": (1,0,-1)}
+            obme_sources["GT-"] = {"tensor-product": ("s", "t-"), "coefficient": -2.0, "qn": (1,0,-1)}
 
     return (ob_observables, obme_sources)
 
@@ -409,17 +479,19 @@ def get_obme_targets_h2mixer(task, tbme_targets):
     Returns:
         (set of str): set of OBME targets for h2mixer
     """
-    # accumulate obme targets
-    obme_targets = set()
-
     # extract dependencies from tbme targets
     #   postfix is irrelevant for this purpose
     tbme_sources = tb.get_tbme_sources(task, tbme_targets, postfix="")
-    for tbme_source in tbme_sources.values():
-        if "operatorU" in tbme_source:
-            obme_targets.add(tbme_source["operatorU"])
-        if "operatorV" in tbme_source:
-            obme_targets.update(tbme_source["operatorV"])
+    obme_targets = {
+        tbme_source["operatorU"]
+        for tbme_source in tbme_sources.values()
+        if "operatorU" in tbme_source
+    }
+    obme_targets.update(itertools.chain.from_iterable(
+        tbme_source["operatorV"]
+        for tbme_source in tbme_sources.values()
+        if "operatorV" in tbme_source
+    ))
 
     return obme_targets
 
@@ -488,7 +560,7 @@ def get_obme_sources(task, targets):
         targets (set): set of targets to generate
 
     Returns:
-        (OrderedDict of dict): id to source mapping, sorted in reverse
+        (dict of dict): id to source mapping, sorted in reverse
             topological order
     """
     # accumulate sources
@@ -501,33 +573,29 @@ def get_obme_sources(task, targets):
         obme_sources.update(**k_kinematic_operators)
     if task.get("basis_mode") in {modes.BasisMode.kDirect, modes.BasisMode.kDilated}:
         obme_sources.update(**k_ladder_operators_native)
-    elif task.get("basis_mode") is modes.BasisMode.kGeneric:
-        obme_sources.update(**ladder_operators_generic(task["hw"]))
 
     # add sources from observable sets
     obme_sources.update(**generate_ob_observable_sets(task)[1])
 
     # set up solid harmonics
-    solid_harmonic_re = re.compile(r"(r|ik)([0-9]+)Y([0-9]+)")
-    iv_solid_harmonic_re = re.compile(r"(r|ik)([0-9]+)Y([0-9]+)tz")
     required_solid_harmonics = set()
     for target_id in targets:
-        match = solid_harmonic_re.match(target_id)
+        match = k_solid_harmonic_re.match(target_id)
         if match:
             required_solid_harmonics.add(match.group(0))
-        match = iv_solid_harmonic_re.match(target_id)
+        match = k_iv_solid_harmonic_re.match(target_id)
         if match:
             required_solid_harmonics.add(match.group(0))
     for source in obme_sources.values():
-        for source_id in list(source.get("linear-combination", {}).keys()) + source.get("tensor-product", []):
-            match = solid_harmonic_re.match(source_id)
+        for source_id in source_dependencies(source):
+            match = k_solid_harmonic_re.match(source_id)
             if match:
                 required_solid_harmonics.add(match.group(0))
-            match = iv_solid_harmonic_re.match(source_id)
+            match = k_iv_solid_harmonic_re.match(source_id)
             if match:
                 required_solid_harmonics.add(match.group(0))
     for solid_harmonic_id in required_solid_harmonics:
-        match = solid_harmonic_re.fullmatch(solid_harmonic_id)
+        match = k_solid_harmonic_re.fullmatch(solid_harmonic_id)
         if match:
             coordinate = match.group(1)
             order = int(match.group(2))
@@ -536,7 +604,7 @@ def get_obme_sources(task, targets):
             assert source_id == solid_harmonic_id
             obme_sources[source_id] = source
 
-        match = iv_solid_harmonic_re.fullmatch(solid_harmonic_id)
+        match = k_iv_solid_harmonic_re.fullmatch(solid_harmonic_id)
         if match:
             coordinate = match.group(1)
             order = int(match.group(2))
@@ -544,33 +612,29 @@ def get_obme_sources(task, targets):
             (source_id, source) = solid_harmonic_source(coordinate, order, J0)
             assert source_id+"tz" == solid_harmonic_id
             obme_sources[solid_harmonic_id] = {
-                "tensor-product": [source_id, "tz"],
+                "tensor-product": (source_id, "tz"),
                 "qn": source["qn"],
             }
 
-    # override with user-defined sources
+    # generic-basis ladder operators are only set up if actually referenced
     user_obme_sources = task.get("obme_sources", [])
+    if task.get("basis_mode") is modes.BasisMode.kGeneric:
+        referenced_ids = set(targets)
+        for source in obme_sources.values():
+            referenced_ids.update(source_dependencies(source))
+        for (_, source) in user_obme_sources:
+            referenced_ids.update(source_dependencies(source))
+        if not referenced_ids.isdisjoint(k_ladder_operator_ids_generic):
+            obme_sources.update(**ladder_operators_generic(task["hw"]))
+
+    # override with user-defined sources
     for (source_id, source) in user_obme_sources:
         if source_id in obme_sources:
             print("WARN: overriding obme source '{:s}' with {}".format(source_id, source))
         obme_sources[source_id] = source
 
-    # construct dependency graph
-    obme_dependency_graph = {}
-    for (source_id, source) in obme_sources.items():
-        if source.get("linear-combination"):
-            obme_dependency_graph[source_id] = source["linear-combination"].keys()
-        elif source.get("tensor-product"):
-            obme_dependency_graph[source_id] = source["tensor-product"]
-        else:
-            obme_dependency_graph[source_id] = []
-
     # construct minimal set of sources (in reverse topological order)
-    sorted_obme_sources = collections.OrderedDict()
-    for id_ in reversed(mcscript.utils.topological_sort(obme_dependency_graph, targets)):
-        sorted_obme_sources[id_] = obme_sources[id_]
-
-    return sorted_obme_sources
+    return sort_sources(obme_sources, targets)
 
 def get_obme_sources_h2mixer(task, targets, postfix):
     """Get OBME sources for task (for use by h2mixer).
@@ -584,7 +648,7 @@ def get_obme_sources_h2mixer(task, targets, postfix):
         targets (set): set of targets to generate
 
     Returns:
-        (OrderedDict of dict): id to source mapping, sorted in reverse
+        (dict of dict): id to source mapping, sorted in reverse
             topological order
     """
     # input normalization
@@ -603,19 +667,11 @@ def get_obme_sources_h2mixer(task, targets, postfix):
             "qn": obme_sources[identifier]["qn"]
         }
 
-    # re-construct dependency graph
-    obme_dependency_graph = {}
-    for (source_id, source) in obme_sources.items():
-        if source.get("linear-combination"):
-            obme_dependency_graph[source_id] = source["linear-combination"].keys()
-        elif source.get("tensor-product"):
-            obme_dependency_graph[source_id] = source["tensor-product"]
-        else:
-            obme_dependency_graph[source_id] = []
-
-    # re-construct minimal set of sources (in reverse topological order)
-    sorted_obme_sources = collections.OrderedDict()
-    for id_ in reversed(mcscript.utils.topological_sort(obme_dependency_graph, targets)):
-        sorted_obme_sources[id_] = obme_sources[id_]
-
-    return sorted_obme_sources
+    # re-construct minimal set of sources
+    #   converting sources to leaf nodes only removes edges, so the existing
+    #   reverse topological order remains valid and need only be filtered
+    dependency_graph = get_dependency_graph(obme_sources, targets)
+    return {
+        id_: source for (id_, source) in obme_sources.items()
+        if id_ in dependency_graph
+    }
@@ -6,7 +6,7 @@ syntax for rel/relcm matrix element sources.
 A relative or relative-cm source is defined by the mapping:
     id: parameters
 where `parameters` is a dict containing the following keys:
-    "type" (RelativeOperatorType): relative or relative-cm operator
+    "type" (RelativeOperatorType or str): relative or relative-cm operator
     "qn" (tuple of int): tuple of (J0,g0,T0_min,T0_max)
     "hw" (float or None): hw of operator or None for hw-independent operators
     "Nmax" (int): Nmax for source
@@ -38,10 +38,9 @@ University of Notre Dame
 - 06/29/22 (pjf): Initial implementation completed.
 """
 from __future__ import annotations
-import collections
 import enum
 import math
-from typing import Optional, OrderedDict
+from typing import Optional
 
 import mcscript.utils
 import mcscript.exception
@@ -54,14 +53,44 @@ from .. import (
 )
 
 @enum.unique
-class RelativeOperatorType(enum.Enum):
+class RelativeOperatorType(str, enum.Enum):
+    """Relative operator type.
+
+    Members are also str instances, so comparisons against source types
+    reduce to plain string comparisons, and the bare strings 'rel' and
+    'relcm' may be used interchangeably with the members.  Members format
+    as their value under str() and format(), on all Python versions.
+    """
     kRelative = 'rel'
     kRelativeCM = 'relcm'
 
+    def __str__(self):
+        return self.value
+
+    def __format__(self, format_spec):
+        return format(self.value, format_spec)
+
+# source types
+#   also used as keys for handler dispatch in relative.py
+k_source_type_file = "file"
+k_source_type_jpv = "jpv"
+k_source_type_relative_gen = "relative-gen"
+k_source_type_relcm_gen = "relcm-gen"
+k_source_type_relative_xform = "relative-xform"
+
 ################################################################
 # relative-gen operators
 ################################################################
 
+# hw corresponding to unit (1 fm) oscillator length, used for operators
+# defined in oscillator-length units
+k_hw_unit_oscillator_length = utils.hw_from_oscillator_length(1.)
+
+# allowed values for source factory arguments
+k_relative_coordinates = frozenset({"r", "k"})
+k_relative_am_operator_names = {"L": "orbital-am", "S": "spin-am"}
+k_coulomb_species = frozenset({"p", "n", "total"})
+
 def relative_zero(Nmax:int):
     """Generate source definition for zero operator in relative coordinates.
 
@@ -76,7 +105,7 @@ def relative_zero(Nmax:int):
         "qn": (0,0,0,0),
         "hw": None,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {"operator_name": "zero"},
     }
 
@@ -94,37 +123,62 @@ def relative_identity(Nmax:int):
         "qn": (0,0,0,0),
         "hw": None,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {"operator_name": "identity"},
     }
 
-def relative_coordinate_sqr(Nmax:int, coordinate:str, T0:int):
-    """Generate source definition for relative coordinate-squared (r^2 or k^2) operator.
+# (J0,g0) for coordinate tensor operators, by operator name
+k_relative_coordinate_operator_qn = {
+    "coordinate-sqr": (0,0),
+    "dipole": (1,1),
+    "quadrupole": (2,0),
+}
+
+def relative_coordinate_operator(Nmax:int, operator_name:str, coordinate:str, T0:int):
+    """Generate source definition for relative coordinate tensor (r or k) operator.
 
     Arguments:
         Nmax (int): truncation for operator
+        operator_name (str): operator ("coordinate-sqr"|"dipole"|"quadrupole")
         coordinate (str): type of operator (r or k)
         T0 (int): isospin tensor character of operator
 
     Returns:
-        (dict): relative coordinate-sqr operator source
+        (dict): relative coordinate operator source
     """
-    if coordinate not in {"r", "k"}:
+    try:
+        (J0, g0) = k_relative_coordinate_operator_qn[operator_name]
+    except KeyError:
+        raise mcscript.exception.ScriptError(f"unknown operator {operator_name}") from None
+    if coordinate not in k_relative_coordinates:
         raise mcscript.exception.ScriptError(f"unknown coordinate {coordinate}")
 
     return {
         "type": RelativeOperatorType.kRelative,
-        "qn": (0,0,T0,T0),
-        "hw": utils.hw_from_oscillator_length(1.),
+        "qn": (J0,g0,T0,T0),
+        "hw": k_hw_unit_oscillator_length,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {
-            "operator_name": "coordinate-sqr",
+            "operator_name": operator_name,
             "coordinate_type": coordinate,
-            "T0": f"{T0:d}",
+            "T0": str(T0),
         },
     }
 
+def relative_coordinate_sqr(Nmax:int, coordinate:str, T0:int):
+    """Generate source definition for relative coordinate-squared (r^2 or k^2) operator.
+
+    Arguments:
+        Nmax (int): truncation for operator
+        coordinate (str): type of operator (r or k)
+        T0 (int): isospin tensor character of operator
+
+    Returns:
+        (dict): relative coordinate-sqr operator source
+    """
+    return relative_coordinate_operator(Nmax, "coordinate-sqr", coordinate, T0)
+
 def relative_dipole(Nmax:int, coordinate:str, T0:int):
     """Generate source definition for relative dipole operator (r or k) operator.
 
@@ -136,21 +190,7 @@ def relative_dipole(Nmax:int, coordinate:str, T0:int):
     Returns:
         (dict): relative dipole operator dictionary
     """
-    if coordinate not in {"r", "k"}:
-        raise mcscript.exception.ScriptError(f"unknown coordinate {coordinate}")
-
-    return {
-        "type": RelativeOperatorType.kRelative,
-        "qn": (1,1,T0,T0),
-        "hw": utils.hw_from_oscillator_length(1.),
-        "Nmax": Nmax,
-        "source_type": "relative-gen",
-        "parameters": {
-            "operator_name": "dipole",
-            "coordinate_type": coordinate,
-            "T0": f"{T0:d}",
-        },
-    }
+    return relative_coordinate_operator(Nmax, "dipole", coordinate, T0)
 
 def relative_quadrupole(Nmax:int, coordinate:str, T0:int):
     """Generate source definition for relative quadrupole operator (r or k) operator.
@@ -163,21 +203,7 @@ def relative_quadrupole(Nmax:int, coordinate:str, T0:int):
     Returns:
         (dict): relative quadrupole operator source
     """
-    if coordinate not in {"r", "k"}:
-        raise mcscript.exception.ScriptError(f"unknown coordinate {coordinate}")
-
-    return {
-        "type": RelativeOperatorType.kRelative,
-        "qn": (2,0,T0,T0),
-        "hw": utils.hw_from_oscillator_length(1.),
-        "Nmax": Nmax,
-        "source_type": "relative-gen",
-        "parameters": {
-            "operator_name": "quadrupole",
-            "coordinate_type": coordinate,
-            "T0": f"{T0:d}",
-        },
-    }
+    return relative_coordinate_operator(Nmax, "quadrupole", coordinate, T0)
 
 def relative_angular_momentum(Nmax:int, am_type:str, T0:int):
     """Generate source definition for two-body angular momentum (L or S) operator.
@@ -190,20 +216,18 @@ def relative_angular_momentum(Nmax:int, am_type:str, T0:int):
     Returns:
         (dict): relative angular momentum operator source
     """
-    if am_type not in {"L", "S"}:
+    if am_type not in k_relative_am_operator_names:
         raise mcscript.exception.ScriptError(f"unknown angular momentum type {am_type}")
 
-    am_type_dict = {"L": "orbital-am", "S": "spin-am"}
-
     return {
         "type": RelativeOperatorType.kRelative,
         "qn": (1,0,T0,T0),
         "hw": None,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {
-            "operator_name": am_type_dict[am_type],
-            "T0": f"{T0:d}",
+            "operator_name": k_relative_am_operator_names[am_type],
+            "T0": str(T0),
         },
     }
 
@@ -218,22 +242,24 @@ def coulomb(Nmax:int, species:str, steps:int):
     Returns:
         (dict): coulomb operator dictionary
     """
-    if species not in {"p", "n", "total"}:
+    if species not in k_coulomb_species:
         raise mcscript.exception.ScriptError(f"unknown species {species}")
 
     return {
         "type": RelativeOperatorType.kRelative,
         "qn": (0,0,0,0 if species == "total" else 2),
-        "hw": utils.hw_from_oscillator_length(1.),
+        "hw": k_hw_unit_oscillator_length,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {
             "operator_name": "coulomb",
             "species": species,
-            "steps": f"{steps:d}",
+            "steps": str(steps),
         },
     }
 
+k_symmunit_parameter_keys = ("T0", "Np", "Lp", "Sp", "Jp", "Tp", "N", "L", "S", "J", "T")
+
 def symmetrized_relative_unit_tensor(
     Nmax:int, J0:int, T0:int,
     Np:int, Lp:int, Sp:int, Jp:int, Tp:int,
@@ -254,32 +280,44 @@ def symmetrized_relative_unit_tensor(
         "qn": (J0,(Lp+L)%2,T0,T0),
         "hw": None,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {
             "operator_name": "symmunit",
-            "T0": f"{T0:d}",
-            "Np": f"{Np:d}",
-            "Lp": f"{Lp:d}",
-            "Sp": f"{Sp:d}",
-            "Jp": f"{Jp:d}",
-            "Tp": f"{Tp:d}",
-            "N": f"{N:d}",
-            "L": f"{L:d}",
-            "S": f"{S:d}",
-            "J": f"{J:d}",
-            "T": f"{T:d}",
+            **dict(zip(
+                k_symmunit_parameter_keys,
+                map(str, (T0, Np, Lp, Sp, Jp, Tp, N, L, S, J, T))
+            )),
         },
     }
 
+def symmetrized_relative_unit_tensors(Nmax:int, J0:int, T0:int, qn_list) -> list[dict]:
+    """Generate source definitions for a set of symmetrized unit tensor operators.
+
+    Arguments:
+        Nmax (int): truncation for operators
+        J0 (int): angular momentum tensor character of operators
+        T0 (int): isospin tensor character of operators
+        qn_list (iterable of tuple): quantum numbers (Np,Lp,Sp,Jp,Tp,N,L,S,J,T)
+            for each unit tensor
+
+    Returns:
+        (list of dict): symmetrized unit tensor operator dictionaries
+    """
+    return [
+        symmetrized_relative_unit_tensor(Nmax, J0, T0, *qn)
+        for qn in qn_list
+    ]
+
 k_interaction_hw_dict = {"Daejeon16": 25}
 
-def relative_interaction(Nmax:int, name:str, params:Optional[list]):
+def relative_interaction(Nmax:int, name:str, params:Optional[tuple[str,...]]=None):
     """Generate source definition for two-body interaction.
 
     Arguments:
         Nmax (int): truncation for operator
         name (str): name of interaction
-        params (list of str): additional (positional) parameters
+        params (tuple of str, optional): additional (positional) parameters;
+            a list is also accepted
 
     Returns:
         (dict): interaction operator dictionary
@@ -290,7 +328,7 @@ def relative_interaction(Nmax:int, name:str, params:Optional[list]):
         "qn": (0,0,0,2),
         "hw": k_interaction_hw_dict.get(name),
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {
             "operator_name": "interaction",
             "interaction": name,
@@ -298,6 +336,14 @@ def relative_interaction(Nmax:int, name:str, params:Optional[list]):
         },
     }
 
+k_LENPIC_regulator_codes = (
+    (0.8, "A"),
+    (0.9, "B"),
+    (1.0, "C"),
+    (1.1, "D"),
+    (1.2, "E"),
+)
+
 def LENPIC_regulator_code(regulator_param:float) -> str:
     """Convert regulator paramater to LENPIC regulator code.
 
@@ -310,20 +356,11 @@ def LENPIC_regulator_code(regulator_param:float) -> str:
     Returns:
         (str): LENPIC regulator code
     """
-    if math.isclose(regulator_param, 0.8):
-        regulator_code = "A"
-    if math.isclose(regulator_param, 0.9):
-        regulator_code = "B"
-    elif math.isclose(regulator_param, 1.0):
-        regulator_code = "C"
-    elif math.isclose(regulator_param, 1.1):
-        regulator_code = "D"
-    elif math.isclose(regulator_param, 1.2):
-        regulator_code = "E"
-    else:
-        raise ValueError("LENPIC regulator codes only defined for R=0.8,0.9,1.0,1.1,1.2fm")
+    for (R, regulator_code) in k_LENPIC_regulator_codes:
+        if math.isclose(regulator_param, R):
+            return regulator_code
 
-    return regulator_code
+    raise ValueError("LENPIC regulator codes only defined for R=0.8,0.9,1.0,1.1,1.2fm")
 
 def LENPIC_SCS_N2LO_gamow_teller(Nmax:int, hw:float, regulator_param:float, steps:int):
     """Generate source definition for LENPIC SCS N2LO Gamow-Teller operator.
@@ -345,7 +382,7 @@ def LENPIC_SCS_N2LO_gamow_teller(Nmax:int, hw:float, regulator_param:float, step
         "qn": (1,0,1,1),
         "hw": hw,
         "Nmax": Nmax,
-        "source_type": "relative-gen",
+        "source_type": k_source_type_relative_gen,
         "parameters": {
             "operator_name": "LENPIC-N2LOGT",
             "regulator": regulator_param,
@@ -371,7 +408,7 @@ def LENPIC_SCS_NLO_M1(Nmax:int, hw:float, regulator_param:float, steps:int):
         "qn": (1,0,1,1),
         "hw": hw,
         "Nmax": Nmax,
-        "source_type": "relcm-gen",
+        "source_type": k_source_type_relcm_gen,
         "parameters": {
             "operator_name": "LENPIC-NLOM1",
             "regulator": regulator_param,
@@ -384,6 +421,7 @@ def dilated_operator(source_operator_id:str, source_operator:dict, target_Nmax:i
     """Generate source definition for numerically-dilated operator.
 
     Arguments:
+        source_operator_id (str): id of source (original hw) operator
         source_operator (dict): dict defining source (original hw) operator
         target_Nmax (int): new truncation after transform
         target_hw (float): new oscillator parameter hw after transform
@@ -392,18 +430,40 @@ def dilated_operator(source_operator_id:str, source_operator:dict, target_Nmax:i
     Returns:
         (dict): operator dict for dilated operator
     """
+    return dilated_operators(
+        source_operator_id, source_operator, [(target_Nmax, target_hw)], steps
+    )[0]
 
-    return {
-        "type": source_operator["type"],
-        "qn": source_operator["qn"],
-        "hw": target_hw,
-        "Nmax": target_Nmax,
-        "source_type": "relative-xform",
-        "parameters": {
-            "steps": steps,
-        },
-        "inputs": [source_operator_id]
-    }
+def dilated_operators(source_operator_id:str, source_operator:dict, targets:list[tuple[int,float]], steps:int=3000):
+    """Generate source definitions for a set of numerically-dilated operators.
+
+    Arguments:
+        source_operator_id (str): id of source (original hw) operator
+        source_operator (dict): dict defining source (original hw) operator
+        targets (list of tuple): (target_Nmax, target_hw) for each dilated operator
+        steps (int, optional): number of steps for overlap integrals
+
+    Returns:
+        (list of dict): operator dicts for dilated operators
+    """
+    # only the type and quantum numbers are taken from the source operator
+    operator_type = source_operator["type"]
+    qn = source_operator["qn"]
+
+    return [
+        {
+            "type": operator_type,
+            "qn": qn,
+            "hw": target_hw,
+            "Nmax": target_Nmax,
+            "source_type": k_source_type_relative_xform,
+            "parameters": {
+                "steps": steps,
+            },
+            "inputs": [source_operator_id]
+        }
+        for (target_Nmax, target_hw) in targets
+    ]
 
 def relative_operator_from_jpv(
     Nmax:int, hw:float, Jmax:int, *,
@@ -446,7 +506,7 @@ def relative_operator_from_jpv(
         "qn": (0,0,0,T0_max),
         "hw": hw,
         "Nmax": Nmax,
-        "source_type": "jpv",
+        "source_type": k_source_type_jpv,
         "parameters": parameters
     }
 
@@ -462,15 +522,16 @@ def get_rel_targets(task) -> set[str]:
     """
     # accumulate relative targets
     rel_targets = set()
-
-    for (basename, qn, operator) in task.get("relative_targets", []):
-        rel_targets.add(operator)
-    for (basename, qn, parameters) in task.get("moshinsky_targets", []):
-        rel_targets.add(parameters["id"])
+    rel_targets.update(
+        operator for (basename, qn, operator) in task.get("relative_targets", ())
+    )
+    rel_targets.update(
+        parameters["id"] for (basename, qn, parameters) in task.get("moshinsky_targets", ())
+    )
 
     return rel_targets
 
-def get_rel_sources(task:dict, targets:set[str]) -> collections.OrderedDict[str, dict]:
+def get_rel_sources(task:dict, targets:set[str]) -> dict[str, dict]:
     """Get OBME sources for task.
 
     Arguments:
@@ -478,28 +539,31 @@ def get_rel_sources(task:dict, targets:set[str]) -> collections.OrderedDict[str,
         targets (set): set of targets to generate
 
     Returns:
-        (OrderedDict of dict): id to source mapping, sorted in reverse
+        (dict of dict): id to source mapping, sorted in reverse
             topological order
     """
-    # accumulate sources
-    rel_sources = {}
-
     # add user-defined sources
-    user_rel_sources = task.get("relative_sources", [])
-    for (source_id, source) in user_rel_sources:
-        if source_id in rel_sources:
-            print(f"WARN: overriding rel source '{source_id:s}' with {source}")
-        rel_sources[source_id] = source
+    #   later definitions override earlier ones; only walk the list for
+    #   warnings if there was actually a collision
+    user_rel_sources = task.get("relative_sources", ())
+    rel_sources = dict(user_rel_sources)
+    if len(rel_sources) != len(user_rel_sources):
+        seen_ids = set()
+        for (source_id, source) in user_rel_sources:
+            if source_id in seen_ids:
+                print(f"WARN: overriding rel source '{source_id:s}' with {source}")
+            seen_ids.add(source_id)
 
     # construct dependency graph
-    rel_dependency_graph = {}
-    for (source_id, source) in rel_sources.items():
-        rel_dependency_graph[source_id] = []
-        rel_dependency_graph[source_id] += source.get("inputs", [])
+    #   inputs are only read by the sort, so they need not be copied
+    rel_dependency_graph = {
+        source_id: source.get("inputs", ())
+        for (source_id, source) in rel_sources.items()
+    }
 
     # construct minimal set of sources (in reverse topological order)
-    sorted_rel_sources = collections.OrderedDict()
-    for id_ in reversed(mcscript.utils.topological_sort(rel_dependency_graph, targets)):
-        sorted_rel_sources[id_] = rel_sources[id_]
-
-    return sorted_rel_sources
+    #   reversed() iterates over the sorted list in place, without copying
+    return {
+        id_: rel_sources[id_]
+        for id_ in reversed(mcscript.utils.topological_sort(rel_dependency_graph, targets))
+    }
@@ -77,8 +77,8 @@ University of Notre Dame
         + Provide "Hmf" observable set (with Hmf) for shell-model Hamiltonian.
 """
 import collections
+import functools
 import math
-import re
 
 import mcscript.utils
 from .. import (
@@ -109,12 +109,106 @@ k_h2mixer_builtin= {
     "identity",
 }
 
+# (hbar c)^2/(m_N c^2) in MeV fm^2, for kinetic energy operators
+k_hbar_c_sqr_over_mN_csqr = constants.k_hbar_c**2/constants.k_mN_csqr
+
+################################################################
+# operator prototypes
+################################################################
+
+# coefficients for operators without parameters, copied on each call
+k_identity = mcscript.utils.CoefficientDict(identity=1.)
+k_Ursqr = mcscript.utils.CoefficientDict({"U[r.r]": 1.})
+k_Vr1r2 = mcscript.utils.CoefficientDict({"V[r,r]": -math.sqrt(3)})
+k_Uksqr = mcscript.utils.CoefficientDict({"U[ik.ik]": -1.})
+k_Vk1k2 = mcscript.utils.CoefficientDict({"V[ik,ik]": math.sqrt(3)})
+k_L2 = mcscript.utils.CoefficientDict({"U[l2]":1., "V[l,l]":2*-math.sqrt(3)})
+k_Sp = mcscript.utils.CoefficientDict({"U[sp]":1.})
+k_Sp2 = mcscript.utils.CoefficientDict({"U[sp2]":1., "V[sp,sp]":2*-math.sqrt(3)})
+k_Sn = mcscript.utils.CoefficientDict({"U[sn]":1.})
+k_Sn2 = mcscript.utils.CoefficientDict({"U[sn2]":1., "V[sn,sn]":2*-math.sqrt(3)})
+k_S = mcscript.utils.CoefficientDict({"U[s]":1.})
+k_Siv = mcscript.utils.CoefficientDict({"U[stz]":2.})
+k_S2 = mcscript.utils.CoefficientDict({"U[s2]":1., "V[s,s]":2*-math.sqrt(3)})
+k_J2 = mcscript.utils.CoefficientDict({"U[j2]":1., "V[j,j]":2*-math.sqrt(3)})
+k_Tz = mcscript.utils.CoefficientDict({"U[tz]":1.})
+k_VNN = mcscript.utils.CoefficientDict(VNN=1.)
+k_VC_unscaled = mcscript.utils.CoefficientDict(VC_unscaled=1.)
+
+
+################################################################
+# memoization
+################################################################
+
+# bound on number of operators cached per factory
+k_operator_cache_size = 32
+
+def _memoized_operator(factory):
+    """Decorator to memoize a composite operator factory.
+
+    Applied only to factories which build their result by combining other
+    operators.  Each call returns a fresh CoefficientDict copy of the cached
+    operator, so that callers may freely modify it.  Calls with unhashable
+    arguments fall through to the underlying factory.
+
+    Arguments:
+        factory (callable): operator factory
+
+    Returns:
+        (callable): memoized factory
+    """
+    cached_factory = functools.lru_cache(maxsize=k_operator_cache_size)(factory)
+
+    @functools.wraps(factory)
+    def wrapper(*args, **kwargs):
+        try:
+            hash((args, tuple(kwargs.items())))
+        except TypeError:
+            return mcscript.utils.CoefficientDict(factory(*args, **kwargs))
+        return mcscript.utils.CoefficientDict(cached_factory(*args, **kwargs))
+
+    wrapper.cache_info = cached_factory.cache_info
+    wrapper.cache_clear = cached_factory.cache_clear
+    return wrapper
+
+
+def _scaled_merge(out, scalar, source):
+    """Accumulate scalar*source into out in place.
+
+    Arguments:
+        out (CoefficientDict): accumulated coefficients (modified)
+        scalar (float): coefficient on source
+        source (mapping): coefficients to add
+
+    Returns:
+        (CoefficientDict): out
+    """
+    get = out.get
+    for (key, value) in source.items():
+        out[key] = get(key, 0.) + scalar*value
+    return out
+
+def _combine(*terms):
+    """Form linear combination of operators in a single pass.
+
+    Arguments:
+        terms (tuple of (float, mapping)): coefficients and operators
+
+    Returns:
+        CoefficientDict containing coefficients for linear combination.
+    """
+    out = mcscript.utils.CoefficientDict()
+    for (scalar, source) in terms:
+        _scaled_merge(out, scalar, source)
+    return out
+
+
 ################################################################
 # identity operator
 ################################################################
 
 def identity():
-    return mcscript.utils.CoefficientDict(identity=1.)
+    return mcscript.utils.CoefficientDict(k_identity)
 
 
 ################################################################
@@ -122,19 +216,19 @@ def identity():
 ################################################################
 
 def Ursqr():
-    return mcscript.utils.CoefficientDict({"U[r.r]": 1.})
+    return mcscript.utils.CoefficientDict(k_Ursqr)
 
 def Vr1r2():
-    return mcscript.utils.CoefficientDict({"V[r,r]": -math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_Vr1r2)
 
 
 # note (pjf): since <b||k||a> is pure imaginary, we actually store <b||ik||a>;
 #   this extra factor of -1 comes from k.k = -(ik).(ik)
 def Uksqr():
-    return mcscript.utils.CoefficientDict({"U[ik.ik]": -1.})
+    return mcscript.utils.CoefficientDict(k_Uksqr)
 
 def Vk1k2():
-    return mcscript.utils.CoefficientDict({"V[ik,ik]": math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_Vk1k2)
 
 
 ################################################################
@@ -142,31 +236,31 @@ def Vk1k2():
 ################################################################
 
 def L2():
-    return mcscript.utils.CoefficientDict({"U[l2]":1., "V[l,l]":2*-math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_L2)
 
 def Sp():
-    return mcscript.utils.CoefficientDict({"U[sp]":1.})
+    return mcscript.utils.CoefficientDict(k_Sp)
 
 def Sp2():
-    return mcscript.utils.CoefficientDict({"U[sp2]":1., "V[sp,sp]":2*-math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_Sp2)
 
 def Sn():
-    return mcscript.utils.CoefficientDict({"U[sn]":1.})
+    return mcscript.utils.CoefficientDict(k_Sn)
 
 def Sn2():
-    return mcscript.utils.CoefficientDict({"U[sn2]":1., "V[sn,sn]":2*-math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_Sn2)
 
 def S():
-    return mcscript.utils.CoefficientDict({"U[s]":1.})
+    return mcscript.utils.CoefficientDict(k_S)
 
 def Siv():
-    return mcscript.utils.CoefficientDict({"U[stz]":2.})
+    return mcscript.utils.CoefficientDict(k_Siv)
 
 def S2():
-    return mcscript.utils.CoefficientDict({"U[s2]":1., "V[s,s]":2*-math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_S2)
 
 def J2():
-    return mcscript.utils.CoefficientDict({"U[j2]":1., "V[j,j]":2*-math.sqrt(3)})
+    return mcscript.utils.CoefficientDict(k_J2)
 
 
 ################################################################
@@ -190,7 +284,7 @@ def Tz():
     Returns:
         CoefficientDict containing coefficients for Tz operator.
     """
-    return mcscript.utils.CoefficientDict({"U[tz]":1.})
+    return mcscript.utils.CoefficientDict(k_Tz)
 
 
 ################################################################
@@ -198,10 +292,10 @@ def Tz():
 ################################################################
 
 def VNN():
-    return mcscript.utils.CoefficientDict(VNN=1.)
+    return mcscript.utils.CoefficientDict(k_VNN)
 
 def VC_unscaled():
-    return mcscript.utils.CoefficientDict(VC_unscaled=1.)
+    return mcscript.utils.CoefficientDict(k_VC_unscaled)
 
 def VC(hw_basis, hw_coul):
     """Coulomb interaction operator.
@@ -213,7 +307,7 @@ def VC(hw_basis, hw_coul):
     Returns:
         CoefficientDict containing coefficients for Coulomb operator.
     """
-    return VC_unscaled() * math.sqrt(hw_basis/hw_coul)
+    return _combine((math.sqrt(hw_basis/hw_coul), k_VC_unscaled))
 
 
 ################################################################
@@ -229,9 +323,10 @@ def rrel2(A):
     Returns:
         CoefficientDict containing coefficients for rrel2 operator.
     """
-    out = mcscript.utils.CoefficientDict()
-    out += ((A-1)/A**2) * Ursqr()
-    out += (-2/A**2) * Vr1r2()
+    out = mcscript.utils.CoefficientDict({
+        "U[r.r]": (A-1)/A**2,
+        "V[r,r]": (-2/A**2)*(-math.sqrt(3)),
+        })
     return out
 
 def Ncm(A, hw):
@@ -245,12 +340,13 @@ def Ncm(A, hw):
         CoefficientDict containing coefficients for Ncm operator.
     """
     bsqr = utils.oscillator_length(hw)**2
-    out = mcscript.utils.CoefficientDict()
-    out += (1/(2*A*bsqr)) * Ursqr()
-    out += (1/(A*bsqr)) * Vr1r2()
-    out += ((1/(2*A))*bsqr) * Uksqr()
-    out += ((1/A)*bsqr) * Vk1k2()
-    out += -3/2 * identity()
+    out = mcscript.utils.CoefficientDict({
+        "U[r.r]": 1/(2*A*bsqr),
+        "V[r,r]": (1/(A*bsqr))*(-math.sqrt(3)),
+        "U[ik.ik]": ((1/(2*A))*bsqr)*(-1.),
+        "V[ik,ik]": ((1/A)*bsqr)*math.sqrt(3),
+        "identity": -3/2,
+        })
     return out
 
 def Ntotal(A, hw):
@@ -264,10 +360,11 @@ def Ntotal(A, hw):
         CoefficientDict containing coefficients for N operator.
     """
     bsqr = utils.oscillator_length(hw)**2
-    out = mcscript.utils.CoefficientDict()
-    out += (1/(2*bsqr)) * Ursqr()
-    out += ((1/2)*bsqr) * Uksqr()
-    out += (-3/2*A) * identity()
+    out = mcscript.utils.CoefficientDict({
+        "U[r.r]": 1/(2*bsqr),
+        "U[ik.ik]": ((1/2)*bsqr)*(-1.),
+        "identity": -3/2*A,
+        })
     return out
 
 def Nex(nuclide, hw):
@@ -280,7 +377,10 @@ def Nex(nuclide, hw):
     Returns:
         CoefficientDict containing coefficients for Nex operator.
     """
-    return Ntotal(A=sum(nuclide), hw=hw) - utils.N0_for_nuclide(nuclide)*identity()
+    return _combine(
+        (1., Ntotal(A=sum(nuclide), hw=hw)),
+        (-utils.N0_for_nuclide(nuclide), k_identity),
+    )
 
 def Nintr(A, hw):
     """Number of oscillator quanta in the intrinsic frame.
@@ -292,7 +392,16 @@ def Nintr(A, hw):
     Returns:
         CoefficientDict containing coefficients for Nintr operator.
     """
-    return Ntotal(A=A, hw=hw) - Ncm(A=A, hw=hw)
+    # Ntotal - Ncm, simplified
+    bsqr = utils.oscillator_length(hw)**2
+    out = mcscript.utils.CoefficientDict({
+        "U[r.r]": (A-1)/(2*A*bsqr),
+        "V[r,r]": (1/(A*bsqr))*math.sqrt(3),
+        "U[ik.ik]": (((A-1)/(2*A))*bsqr)*(-1.),
+        "V[ik,ik]": ((1/A)*bsqr)*(-math.sqrt(3)),
+        "identity": -3/2*(A-1),
+        })
+    return out
 
 def Tintr(A):
     """Two-body intrinsic kinetic energy operator.
@@ -303,9 +412,10 @@ def Tintr(A):
     Returns:
         CoefficientDict containing coefficients for Tintr operator.
     """
-    out = mcscript.utils.CoefficientDict()
-    out += ((A-1)/(2*A)) * (constants.k_hbar_c**2/constants.k_mN_csqr) * Uksqr()
-    out += (-1/A) * (constants.k_hbar_c**2/constants.k_mN_csqr) * Vk1k2()
+    out = mcscript.utils.CoefficientDict({
+        "U[ik.ik]": ((A-1)/(2*A)) * k_hbar_c_sqr_over_mN_csqr * (-1.),
+        "V[ik,ik]": (-1/A) * k_hbar_c_sqr_over_mN_csqr * math.sqrt(3),
+        })
     return out
 
 def Tcm(A):
@@ -317,9 +427,10 @@ def Tcm(A):
     Returns:
         CoefficientDict containing coefficients for Tcm operator.
     """
-    out = mcscript.utils.CoefficientDict()
-    out += (1/(2*A)) * (constants.k_hbar_c**2/constants.k_mN_csqr) * Uksqr()
-    out += (1/A) * (constants.k_hbar_c**2/constants.k_mN_csqr) * Vk1k2()
+    out = mcscript.utils.CoefficientDict({
+        "U[ik.ik]": (1/(2*A)) * k_hbar_c_sqr_over_mN_csqr * (-1.),
+        "V[ik,ik]": (1/A) * k_hbar_c_sqr_over_mN_csqr * math.sqrt(3),
+        })
     return out
 
 def r2intr(A):
@@ -332,8 +443,8 @@ def r2intr(A):
         CoefficientDict containing coefficients for r2intr operator.
     """
     out = mcscript.utils.CoefficientDict()
-    out += (1-1/A) * Ursqr()
-    out += (-2/A) * Vr1r2()
+    _scaled_merge(out, 1-1/A, k_Ursqr)
+    _scaled_merge(out, -2/A, k_Vr1r2)
     return out
 
 def r2ivintr(nuclide):
@@ -347,14 +458,17 @@ def r2ivintr(nuclide):
     """
     (Z,N) = nuclide
     A = Z+N
-    out = 2*mcscript.utils.CoefficientDict({  # overall factor of 2 from tz vs. \tau_0
+    out = mcscript.utils.CoefficientDict()
+    _scaled_merge(out, 2, {  # overall factor of 2 from tz vs. \tau_0
         "U[r.rtz]": 1-2/A,
         "V[rtz,r]": -2/A*(-math.sqrt(3)),
         "V[r,rtz]": -2/A*(-math.sqrt(3)),
         })
-    out += (Z-N)/A**2 * Ursqr() + 2*(Z-N)/A**2 * Vr1r2()
+    _scaled_merge(out, (Z-N)/A**2, k_Ursqr)
+    _scaled_merge(out, 2*(Z-N)/A**2, k_Vr1r2)
     return out
 
+@_memoized_operator
 def rp2intr(nuclide):
     """Two-body intrinsic proton r^2 operator.
 
@@ -367,9 +481,10 @@ def rp2intr(nuclide):
     Returns:
         CoefficientDict containing coefficients for rp2intr operator.
     """
-    out = (r2intr(A=sum(nuclide)) + r2ivintr(nuclide=nuclide))/2
+    out = _combine((1/2, r2intr(A=sum(nuclide))), (1/2, r2ivintr(nuclide=nuclide)))
     return out
 
+@_memoized_operator
 def rn2intr(nuclide):
     """Two-body intrinsic neutron r^2 operator.
 
@@ -382,7 +497,7 @@ def rn2intr(nuclide):
     Returns:
         CoefficientDict containing coefficients for rn2intr operator.
     """
-    out = (r2intr(A=sum(nuclide)) - r2ivintr(nuclide=nuclide))/2
+    out = _combine((1/2, r2intr(A=sum(nuclide))), (-1/2, r2ivintr(nuclide=nuclide)))
     return out
 
 def rNN2(nuclide):
@@ -492,17 +607,17 @@ def Livintr(nuclide):
     """
     (Z,N) = nuclide
     A = Z+N
-    out = 2*mcscript.utils.CoefficientDict({  # overall factor of 2 from tz vs. \tau_0
-        "U[ltz]": 1-2/A,
-        "V[rtz,ik]": 2*math.sqrt(2)/A,
-        "V[r,iktz]": 2*math.sqrt(2)/A,
-        })
-    out += mcscript.utils.CoefficientDict({
+    out = mcscript.utils.CoefficientDict({
+        # overall factor of 2 from tz vs. \tau_0
+        "U[ltz]": 2*(1-2/A),
+        "V[rtz,ik]": 2*(2*math.sqrt(2)/A),
+        "V[r,iktz]": 2*(2*math.sqrt(2)/A),
         "U[l]": (Z-N)/A**2,
         "V[r,ik]": -2*math.sqrt(2)*(Z-N)/A**2,
         })
     return out
 
+@_memoized_operator
 def Lpintr(nuclide):
     """Two-body intrinsic proton L operator.
 
@@ -512,9 +627,10 @@ def Lpintr(nuclide):
     Returns:
         CoefficientDict containing coefficients for Lpintr operator.
     """
-    out = (Lintr(sum(nuclide)) + Livintr(nuclide))/2
+    out = _combine((1/2, Lintr(sum(nuclide))), (1/2, Livintr(nuclide)))
     return out
 
+@_memoized_operator
 def Lnintr(nuclide):
     """Two-body intrinsic neutron L operator.
 
@@ -524,9 +640,10 @@ def Lnintr(nuclide):
     Returns:
         CoefficientDict containing coefficients for Lnintr operator.
     """
-    out = (Lintr(sum(nuclide)) - Livintr(nuclide))/2
+    out = _combine((1/2, Lintr(sum(nuclide))), (-1/2, Livintr(nuclide)))
     return out
 
+@_memoized_operator
 def M1intr(nuclide):
     """Two-body intrinsic M1 operator.
 
@@ -536,7 +653,11 @@ def M1intr(nuclide):
     Returns:
         CoefficientDict containing coefficients for M1intr operator.
     """
-    out = Lpintr(nuclide) + constants.k_gp*(S()+Siv())/2 + constants.k_gn*(S()-Siv())/2
+    out = _combine(
+        (1., Lpintr(nuclide)),
+        (constants.k_gp/2, k_S), (constants.k_gp/2, k_Siv),
+        (constants.k_gn/2, k_S), (-constants.k_gn/2, k_Siv),
+    )
     out *= math.sqrt(3/(4*math.pi))
     return out
 
@@ -566,17 +687,17 @@ def Qivintr(nuclide):
     """
     (Z,N) = nuclide
     A = Z+N
-    out = 2*mcscript.utils.CoefficientDict({  # overall factor of 2 from tz vs. \tau_0
-        "U[r2Y2tz]": 1-2/A,
-        "V[rtz,r]": -2*math.sqrt(15/(8*math.pi))/A,
-        "V[r,rtz]": -2*math.sqrt(15/(8*math.pi))/A
-        })
-    out += mcscript.utils.CoefficientDict({
+    out = mcscript.utils.CoefficientDict({
+        # overall factor of 2 from tz vs. \tau_0
+        "U[r2Y2tz]": 2*(1-2/A),
+        "V[rtz,r]": 2*(-2*math.sqrt(15/(8*math.pi))/A),
+        "V[r,rtz]": 2*(-2*math.sqrt(15/(8*math.pi))/A),
         "U[r2Y2]": (Z-N)/A**2,
-        "V[r,r]": 2*math.sqrt(15/(8*math.pi))*(Z-N)/A**2
+        "V[r,r]": 2*math.sqrt(15/(8*math.pi))*(Z-N)/A**2,
         })
     return out
 
+@_memoized_operator
 def Qpintr(nuclide):
     """Two-body intrinsic proton quadrupole operator.
 
@@ -586,9 +707,10 @@ def Qpintr(nuclide):
     Returns:
         CoefficientDict containing coefficients for Qpintr operator.
     """
-    out = (Qintr(sum(nuclide)) + Qivintr(nuclide))/2
+    out = _combine((1/2, Qintr(sum(nuclide))), (1/2, Qivintr(nuclide)))
     return out
 
+@_memoized_operator
 def Qnintr(nuclide):
     """Two-body intrinsic neutron quadrupole operator.
 
@@ -598,7 +720,7 @@ def Qnintr(nuclide):
     Returns:
         CoefficientDict containing coefficients for Qnintr operator.
     """
-    out = (Qintr(sum(nuclide)) - Qivintr(nuclide))/2
+    out = _combine((1/2, Qintr(sum(nuclide))), (-1/2, Qivintr(nuclide)))
     return out
 
 
@@ -606,6 +728,50 @@ def Qnintr(nuclide):
 # standard NCCI Hamiltonian
 ################################################################
 
+def _Hamiltonian_components(
+        A, hw, a_cm, hw_cm, use_coulomb, include_ke, hw_coul, hw_coul_rescaled,
+):
+    """Construct the terms of the standard NCCI Hamiltonian.
+
+    Arguments:
+        (as for Hamiltonian)
+
+    Returns:
+        (dict of CoefficientDict): terms "Tintr", "VNN", "VC", and "Ncm"
+            (without the Lawson coefficient), omitting those which are not
+            present in the Hamiltonian
+    """
+    if hw_cm is None:
+        hw_cm = hw
+    if hw_coul_rescaled is None:
+        hw_coul_rescaled = hw
+
+    # only construct terms which are actually present
+    components = {}
+    if include_ke:
+        components["Tintr"] = Tintr(A=A)
+    components["VNN"] = VNN()
+    if use_coulomb:
+        components["VC"] = VC(hw_basis=hw_coul_rescaled, hw_coul=hw_coul)
+    if a_cm != 0:
+        components["Ncm"] = Ncm(A=A, hw=hw_cm)
+    return components
+
+def _sum_Hamiltonian_components(components, a_cm):
+    """Sum terms from _Hamiltonian_components into the Hamiltonian.
+
+    Arguments:
+        components (dict of CoefficientDict): Hamiltonian terms
+        a_cm (float): Lawson term coefficient
+
+    Returns:
+        CoefficientDict containing coefficients for Hamiltonian.
+    """
+    hamiltonian = mcscript.utils.CoefficientDict()
+    for (name, term) in components.items():
+        _scaled_merge(hamiltonian, a_cm if name == "Ncm" else 1., term)
+    return hamiltonian
+
 def Hamiltonian(
         A, hw, a_cm=0., hw_cm=None, use_coulomb=True, include_ke = True, hw_coul=None, hw_coul_rescaled=None,
         **kwargs,
@@ -624,22 +790,12 @@ def Hamiltonian(
     Returns:
         CoefficientDict containing coefficients for Hamiltonian.
     """
-    if hw_cm is None:
-        hw_cm = hw
-    if hw_coul_rescaled is None:
-        hw_coul_rescaled = hw
-    
-    lawson_term = a_cm * Ncm(A=A, hw=hw_cm)
-    interaction = VNN()
-    if use_coulomb:
-        coulomb_interaction = VC(hw_basis=hw_coul_rescaled, hw_coul=hw_coul)
-    else:
-        coulomb_interaction = mcscript.utils.CoefficientDict()
-    if include_ke:
-        kinetic_energy = Tintr(A=A)
-    else:
-        kinetic_energy = mcscript.utils.CoefficientDict()
-    return (kinetic_energy + interaction + coulomb_interaction + lawson_term)
+    components = _Hamiltonian_components(
+        A=A, hw=hw, a_cm=a_cm, hw_cm=hw_cm,
+        use_coulomb=use_coulomb, include_ke=include_ke,
+        hw_coul=hw_coul, hw_coul_rescaled=hw_coul_rescaled,
+    )
+    return _sum_Hamiltonian_components(components, a_cm)
 
 
 ################################################################
@@ -668,10 +824,11 @@ def ShellModelHamiltonian(
     """
 
     valence_nucleons = A - core_nucleons
-    Hmf = mcscript.utils.CoefficientDict(Hmf_unscaled=1/(valence_nucleons-1))
     scale_factor = ((core_nucleons+2)/A)**power
-    Vres = mcscript.utils.CoefficientDict(Vres_unscaled=scale_factor)
-    return (Hmf + Vres)
+    return mcscript.utils.CoefficientDict(
+        Hmf_unscaled=1/(valence_nucleons-1),
+        Vres_unscaled=scale_factor,
+    )
 
 
 ################################################################
@@ -701,7 +858,7 @@ def J_filter_term(
 
     if mode==modes.JFilterMode.kEnabled or (mode==modes.JFilterMode.kM0Only and M==0.0):
         coefficient = utils.J_sqr_coefficient_for_energy_shift(M, energy_shift, delta_J=delta_J)
-        term = coefficient*(J2() - M*(M+1)*identity())
+        term = _combine((coefficient, k_J2), (coefficient*(-M*(M+1)), k_identity))
     else:
         term = mcscript.utils.CoefficientDict()
 
@@ -719,7 +876,7 @@ def get_tbme_targets(task):
         task (dict): as described in module docstring
 
     Returns:
-        (dict of OrderedDict of CoefficientDict): targets and definitions
+        (dict of dict of CoefficientDict): targets and definitions
             grouped by quantum number
     """
     # extract parameters for convenience
@@ -741,8 +898,13 @@ def get_tbme_targets(task):
         hw_coul_rescaled = hw
     tb_observable_sets = task.get("tb_observable_sets", [])
 
-    # accumulate h2mixer targets
-    targets = collections.defaultdict(collections.OrderedDict)
+    # accumulate h2mixer targets (predefined targets are mostly scalar, and
+    # are collected separately until the nonscalar targets are reached)
+    scalar_targets = {}
+    targets = {}
+
+    # terms of standard Hamiltonian, reused for Hamiltonian components
+    hamiltonian_components = {}
 
     # targets for diagonalization
     if task.get("diagonalization"):
@@ -750,31 +912,34 @@ def get_tbme_targets(task):
         if (task["basis_mode"] in {
                     modes.BasisMode.kDirect, modes.BasisMode.kDilated, modes.BasisMode.kGeneric,
             }):
-            targets[(0,0,0)]["rrel2"] = rrel2(A=A)
+            scalar_targets["rrel2"] = rrel2(A=A)
         elif task["basis_mode"] is modes.BasisMode.kShellModel:
             # provide zero operator as a "dummy operator (to keep MFDn happy and
             # still allow subsequent TBOs to be calculated)
-            targets[(0,0,0)]["rrel2"] = mcscript.utils.CoefficientDict()
+            scalar_targets["rrel2"] = mcscript.utils.CoefficientDict()
 
     # Hamiltonian
     if task.get("diagonalization"):
         # target: Hamiltonian
         if isinstance(task.get("hamiltonian"), collections.abc.MutableMapping):
-            targets[(0,0,0)]["H"] = task["hamiltonian"]
+            scalar_targets["H"] = task["hamiltonian"]
         else:
             if (task["basis_mode"] in {
                     modes.BasisMode.kDirect, modes.BasisMode.kDilated, modes.BasisMode.kGeneric,
             }):
-                targets[(0,0,0)]["H"] = Hamiltonian(
+                hamiltonian_components = _Hamiltonian_components(
                     A=A, hw=hw, a_cm=a_cm, hw_cm=hw_cm,
                     include_ke=task.get("include_ke", True),
                     use_coulomb=task["use_coulomb"], hw_coul=hw_coul,
                     hw_coul_rescaled=hw_coul_rescaled,
                 )
+                scalar_targets["H"] = _sum_Hamiltonian_components(
+                    hamiltonian_components, a_cm
+                )
             elif task["basis_mode"] is modes.BasisMode.kShellModel:
                 core_nucleons = sum(task["truncation_parameters"]["mb_core"])
                 tbme_scaling_power = task["tbme_scaling_power"]
-                targets[(0,0,0)]["H"] = ShellModelHamiltonian(
+                scalar_targets["H"] = ShellModelHamiltonian(
                     core_nucleons, A, tbme_scaling_power,
                 )
             else:
@@ -791,7 +956,10 @@ def get_tbme_targets(task):
         if task["basis_mode"] in {
                 modes.BasisMode.kDirect, modes.BasisMode.kDilated, modes.BasisMode.kGeneric,
         }:
-            targets[(0,0,0)]["Ncm"] = Ncm(A=A, hw=hw_cm)
+            if "Ncm" in hamiltonian_components:
+                scalar_targets["Ncm"] = mcscript.utils.CoefficientDict(hamiltonian_components["Ncm"])
+            else:
+                scalar_targets["Ncm"] = Ncm(A=A, hw=hw_cm)
 
     # optional observable sets
     # Hamiltonian components
@@ -800,56 +968,72 @@ def get_tbme_targets(task):
                 modes.BasisMode.kDirect, modes.BasisMode.kDilated, modes.BasisMode.kGeneric,
         }:
             # target: Trel (diagnostic)
-            targets[(0,0,0)]["Tintr"] = Tintr(A=A)
+            if "Tintr" in hamiltonian_components:
+                scalar_targets["Tintr"] = mcscript.utils.CoefficientDict(hamiltonian_components["Tintr"])
+            else:
+                scalar_targets["Tintr"] = Tintr(A=A)
             # target: Tcm (diagnostic)
-            targets[(0,0,0)]["Tcm"] = Tcm(A=A)
+            scalar_targets["Tcm"] = Tcm(A=A)
             # target: Ncm
-            targets[(0,0,0)]["Ncm"] = Ncm(A=A, hw=hw_cm)
+            if "Ncm" not in scalar_targets:
+                scalar_targets["Ncm"] = Ncm(A=A, hw=hw_cm)
             # target: VNN (diagnostic)
-            if "VNN" in targets[(0,0,0)]["H"]:
-                targets[(0,0,0)]["VNN"] = VNN()
+            if "VNN" in hamiltonian_components:
+                scalar_targets["VNN"] = mcscript.utils.CoefficientDict(hamiltonian_components["VNN"])
+            elif "VNN" in scalar_targets["H"]:
+                scalar_targets["VNN"] = VNN()
             # target: VC (diagnostic)
-            if "VC_unscaled" in targets[(0,0,0)]["H"]:
-                targets[(0,0,0)]["VC"] = VC(hw_basis=hw_coul_rescaled, hw_coul=hw_coul)
+            if "VC" in hamiltonian_components:
+                scalar_targets["VC"] = mcscript.utils.CoefficientDict(hamiltonian_components["VC"])
+            elif "VC_unscaled" in scalar_targets["H"]:
+                scalar_targets["VC"] = VC(hw_basis=hw_coul_rescaled, hw_coul=hw_coul)
     if "Hmf" in tb_observable_sets:
         if task["basis_mode"] is modes.BasisMode.kShellModel:
             valence_nucleons = A - sum(task["truncation_parameters"]["mb_core"])
-            targets[(0,0,0)]["Hmf"] = mcscript.utils.CoefficientDict(Hmf_unscaled=1/(valence_nucleons-1))
+            scalar_targets["Hmf"] = mcscript.utils.CoefficientDict(Hmf_unscaled=1/(valence_nucleons-1))
         
     # coulomb component
     if "VC" in tb_observable_sets:
-        targets[(0,0,0)]["VC"] = VC(hw_basis=hw_coul_rescaled, hw_coul=hw_coul)
+        scalar_targets["VC"] = VC(hw_basis=hw_coul_rescaled, hw_coul=hw_coul)
             
     # squared angular momenta
     if "am-sqr" in tb_observable_sets:
-        targets[(0,0,0)]["L2"] = L2()
-        targets[(0,0,0)]["Sp2"] = Sp2()
-        targets[(0,0,0)]["Sn2"] = Sn2()
-        targets[(0,0,0)]["S2"] = S2()
-        targets[(0,0,0)]["J2"] = J2()
+        scalar_targets["L2"] = L2()
+        scalar_targets["Sp2"] = Sp2()
+        scalar_targets["Sn2"] = Sn2()
+        scalar_targets["S2"] = S2()
+        scalar_targets["J2"] = J2()
     if "isospin" in tb_observable_sets:
-        targets[(0,0,0)]["T2"] = T2(A=A)
+        scalar_targets["T2"] = T2(A=A)
         
     # intrinsic electromagnetic operators
     if "intrinsic-E0" in tb_observable_sets:
-        targets[(0,0,0)]["E0p"] = rp2intr(nuclide=nuclide)
-        targets[(0,0,0)]["E0n"] = rn2intr(nuclide=nuclide)
+        scalar_targets["E0p"] = rp2intr(nuclide=nuclide)
+        scalar_targets["E0n"] = rn2intr(nuclide=nuclide)
+
+    # scalar targets come first, if any were requested
+    if scalar_targets:
+        targets[(0,0,0)] = scalar_targets
+
     if "intrinsic-M1" in tb_observable_sets:
         # sqrt(3/4pi) comes from the normalization of the spherical harmonics
-        targets[(1,0,0)]["M1"] = M1intr(nuclide=nuclide)
-        targets[(1,0,0)]["DLp"] = math.sqrt(3/(4*math.pi))*Lpintr(nuclide=nuclide)
-        targets[(1,0,0)]["DLn"] = math.sqrt(3/(4*math.pi))*Lnintr(nuclide=nuclide)
-        targets[(1,0,0)]["DSp"] = math.sqrt(3/(4*math.pi))*Sp()
-        targets[(1,0,0)]["DSn"] = math.sqrt(3/(4*math.pi))*Sn()
+        dipole_coefficient = math.sqrt(3/(4*math.pi))
+        dipole_targets = targets.setdefault((1,0,0), {})
+        dipole_targets["M1"] = M1intr(nuclide=nuclide)
+        dipole_targets["DLp"] = _combine((dipole_coefficient, Lpintr(nuclide=nuclide)))
+        dipole_targets["DLn"] = _combine((dipole_coefficient, Lnintr(nuclide=nuclide)))
+        dipole_targets["DSp"] = _combine((dipole_coefficient, k_Sp))
+        dipole_targets["DSn"] = _combine((dipole_coefficient, k_Sn))
     if "intrinsic-E2" in tb_observable_sets:
-        targets[(2,0,0)]["E2p"] = Qpintr(nuclide=nuclide)
-        targets[(2,0,0)]["E2n"] = Qnintr(nuclide=nuclide)
+        quadrupole_targets = targets.setdefault((2,0,0), {})
+        quadrupole_targets["E2p"] = Qpintr(nuclide=nuclide)
+        quadrupole_targets["E2n"] = Qnintr(nuclide=nuclide)
 
     # accumulate user observables
     for (basename, qn, operator) in task.get("tb_observables", []):
-        targets[qn][basename] = mcscript.utils.CoefficientDict(operator)
+        targets.setdefault(qn, {})[basename] = mcscript.utils.CoefficientDict(operator)
 
-    return dict(targets)
+    return targets
 
 def get_tbme_sources(task, targets, postfix):
     """Get TBME sources needed for given targets.
@@ -859,17 +1043,22 @@ def get_tbme_sources(task, targets, postfix):
         targets (dict of CoefficientDict): target channels
 
     Returns:
-        (OrderedDict of dict): source id to source mapping
+        (dict of dict): source id to source mapping
     """
     # determine required sources
-    required_tbme_sources = set()
-    required_tbme_sources.update(*[op.keys() for op in targets.values()])
+    required_tbme_sources = set().union(*(op.keys() for op in targets.values()))
+
+    # determine sources still to be defined, after user-provided overrides
+    user_tbme_sources = task.get("tbme_sources", [])
+    pending_tbme_sources = required_tbme_sources.difference(
+        source_id for (source_id, _) in user_tbme_sources
+    )
 
     # tbme sources: accumulate definitions
-    tbme_sources = collections.OrderedDict()
+    tbme_sources = {}
 
     # tbme sources: VNN
-    if "VNN" in required_tbme_sources:
+    if "VNN" in pending_tbme_sources:
         VNN_filename = task.get("interaction_file")
         xform_truncation_int = task.get("xform_truncation_int")
         if VNN_filename is None:
@@ -891,7 +1080,7 @@ def get_tbme_sources(task, targets, postfix):
             )
 
     # tbme sources: shell model
-    if "Hmf_unscaled" in required_tbme_sources:
+    if "Hmf_unscaled" in pending_tbme_sources:
         Hmf_filename = task.get("Hmf_file")
         if Hmf_filename is None:
             Hmf_filename = environ.find_interaction_file(
@@ -900,7 +1089,7 @@ def get_tbme_sources(task, targets, postfix):
                 None,
             )
         tbme_sources["Hmf_unscaled"] = dict(filename=Hmf_filename)
-    if "Vres_unscaled" in required_tbme_sources:
+    if "Vres_unscaled" in pending_tbme_sources:
         Vres_filename = task.get("Vres_file")
         if Vres_filename is None:
             Vres_filename = environ.find_interaction_file(
@@ -914,7 +1103,7 @@ def get_tbme_sources(task, targets, postfix):
     #
     # Note: This is the "unscaled" Coulomb, still awaiting the scaling
     # factor from dilation.
-    if "VC_unscaled" in required_tbme_sources:
+    if "VC_unscaled" in pending_tbme_sources:
         VC_filename = task.get("coulomb_file")
         xform_truncation_coul = task.get("xform_truncation_coul")
         if VC_filename is None:
@@ -942,27 +1131,32 @@ def get_tbme_sources(task, targets, postfix):
                 xform_truncation=xform_truncation_coul
             )
 
-    # tbme sources: h2mixer built-ins
-    builtin_tbme_sources = k_h2mixer_builtin
-    for source in sorted(builtin_tbme_sources - set(tbme_sources.keys())):
-        tbme_sources[source] = dict()
+    # tbme sources: h2mixer built-ins, upgraded one-body ("U[a]") and
+    # separable ("V[a,b]") operators
+    builtin_tbme_sources = k_h2mixer_builtin - (required_tbme_sources - pending_tbme_sources)
+    for source in sorted((builtin_tbme_sources | pending_tbme_sources) - tbme_sources.keys()):
+        if source in k_h2mixer_builtin:
+            tbme_sources[source] = dict()
+            continue
+
+        # skip sources not of the form X[...]
+        if (len(source) < 4) or (source[-1] != "]"):
+            continue
+        (prefix, arguments) = (source[:2], source[2:-1])
 
-    # tbme sources: upgraded one-body and separable operators
-    for source in sorted(required_tbme_sources - set(tbme_sources.keys())):
         # parse upgraded one-body operator
-        match = re.fullmatch(r"U\[(.+)\]", source)
-        if match:
-            tbme_sources[source] = {"operatorU": match.group(1)}
+        if prefix == "U[":
+            tbme_sources[source] = {"operatorU": arguments}
             continue
 
-        # parse separable operator
-        match = re.fullmatch(r"V\[(.+),(.+)\]", source)
-        if match:
-            tbme_sources[source] = {"operatorV": (match.group(1), match.group(2))}
+        # parse separable operator (split on last comma)
+        if prefix == "V[":
+            (operator_a, comma, operator_b) = arguments.rpartition(",")
+            if operator_a and operator_b:
+                tbme_sources[source] = {"operatorV": (operator_a, operator_b)}
             continue
 
     # tbme sources: override with user-provided
-    user_tbme_sources = task.get("tbme_sources", [])
     for (source_id, source) in user_tbme_sources:
         if source_id in required_tbme_sources:
             tbme_sources[source_id] = source
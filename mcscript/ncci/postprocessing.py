@@ -61,8 +61,9 @@ import glob
 import hashlib
 import itertools
 import math
+import operator
 import os
-import re
+import shutil
 import sqlite3
 import warnings
 
@@ -87,6 +88,132 @@ from . import (
     utils,
     )
 
+# parsed density filename fields (absent optional fields are taken as 0)
+StatRobdmeFileInfo = collections.namedtuple(
+    "StatRobdmeFileInfo", ["code", "seq", "twoJ", "g", "n", "twoT"]
+)
+RobdmeFileInfo = collections.namedtuple(
+    "RobdmeFileInfo",
+    ["code", "seqf", "twoJf", "gf", "nf", "twoTf", "seqi", "twoJi", "gi", "ni", "twoTi"]
+)
+
+
+def _parse_tagged_int(token, tag, num_digits=None):
+    """Parse integer field from density filename token of form <tag><digits>.
+
+    Arguments:
+        token (str): filename token (e.g., "2J03")
+        tag (str): expected tag (e.g., "2J")
+        num_digits (int, optional): required number of digits
+
+    Returns:
+        (int): field value
+
+    Raises:
+        ValueError: if token does not have the expected form
+    """
+    digits = token[len(tag):]
+    if not (token.startswith(tag) and digits.isdigit()):
+        raise ValueError("bad filename token: {}".format(token))
+    if (num_digits is not None) and (len(digits) != num_digits):
+        raise ValueError("bad filename token: {}".format(token))
+    return int(digits)
+
+
+def parse_statrobdme_filename(name):
+    """Parse static density filename.
+
+    Filename has form <code>.statrobdme.seqNNN.2JNN[.pN].nNN.2TNN, where
+    parity field is present for v14 only.
+
+    Arguments:
+        name (str): basename of density file
+
+    Returns:
+        (StatRobdmeFileInfo): parsed fields
+
+    Raises:
+        ValueError: if filename cannot be parsed
+    """
+    (code, _, suffix) = name.rpartition(".statrobdme.")
+    tokens = suffix.split(".")
+    try:
+        if not code:
+            raise ValueError
+        seq = _parse_tagged_int(tokens[0], "seq", 3)
+        twoJ = _parse_tagged_int(tokens[1], "2J", 2)
+        i = 2
+        g = 0
+        if tokens[i][:1] == "p":
+            g = _parse_tagged_int(tokens[i], "p", 1)
+            i += 1
+        n = _parse_tagged_int(tokens[i], "n", 2)
+        twoT = _parse_tagged_int(tokens[i+1], "2T", 2)
+    except (ValueError, IndexError):
+        raise ValueError("bad statrobdme filename: {}".format(name)) from None
+    return StatRobdmeFileInfo(code, seq, twoJ, g, n, twoT)
+
+
+def _parse_robdme_state(tokens, i):
+    """Parse quantum numbers of one state from transition density filename tokens.
+
+    Fields are [seqNNN.]2JNN[.(p|g)N].nNN[.2TNN], where sequence number and 2T
+    are present for MFDn only, and parity is present for v14/postprocessor only.
+
+    Arguments:
+        tokens (list of str): filename tokens
+        i (int): index of first token for state
+
+    Returns:
+        (tuple): (seq, twoJ, g, n, twoT), with absent fields taken as 0
+        (int): index of next unparsed token
+    """
+    seq = 0
+    if tokens[i].startswith("seq"):
+        seq = _parse_tagged_int(tokens[i], "seq")
+        i += 1
+    twoJ = _parse_tagged_int(tokens[i], "2J")
+    i += 1
+    g = 0
+    if tokens[i][:1] in ("p", "g"):
+        g = _parse_tagged_int(tokens[i], tokens[i][0], 1)
+        i += 1
+    n = _parse_tagged_int(tokens[i], "n")
+    i += 1
+    twoT = 0
+    if (i < len(tokens)) and tokens[i].startswith("2T"):
+        twoT = _parse_tagged_int(tokens[i], "2T")
+        i += 1
+    return ((seq, twoJ, g, n, twoT), i)
+
+
+def parse_robdme_filename(name):
+    """Parse transition density filename.
+
+    Filename has form <code>.robdme.<final>.<initial>, where each state is
+    given by the fields described in _parse_robdme_state.
+
+    Arguments:
+        name (str): basename of density file
+
+    Returns:
+        (RobdmeFileInfo): parsed fields
+
+    Raises:
+        ValueError: if filename cannot be parsed
+    """
+    (code, _, suffix) = name.rpartition(".robdme.")
+    tokens = suffix.split(".")
+    try:
+        if not code:
+            raise ValueError
+        (qnf, i) = _parse_robdme_state(tokens, 0)
+        (qni, i) = _parse_robdme_state(tokens, i)
+    except (ValueError, IndexError):
+        raise ValueError("bad robdme filename: {}".format(name)) from None
+    return RobdmeFileInfo(code, *qnf, *qni)
+
+
 def evaluate_ob_observables(task, postfix=""):
     """Evaluate one-body observables with obscalc-ob.
 
@@ -95,178 +222,83 @@ def evaluate_ob_observables(task, postfix=""):
         postfix (string, optional): identifier to add to generated files
     """
 
-    work_dir = "work{:s}".format(postfix)
+    work_dir = f"work{postfix:s}"
 
     # accumulate obscalc-ob input lines
     lines = []
 
     # initial comment
-    lines.append("# task: {}".format(task))
+    lines.append(f"# task: {task}")
     lines.append("")
 
     # indexing setup
     lines += [
-        "set-indexing {:s}".format(environ.orbitals_filename(postfix)),
-        "set-output-file {:s} append".format(environ.obscalc_ob_res_filename(postfix)),
+        f"set-indexing {environ.orbitals_filename(postfix):s}",
+        f"set-output-file {environ.obscalc_ob_res_filename(postfix):s} append",
         ]
 
     # set up operators
     ob_observables = operators.ob.generate_ob_observable_sets(task)[0]
     ob_observables += task.get("ob_observables", [])
-    for (operator_id, _, operator) in ob_observables:
-        lines.append(
-            "define-operator {:s} {:s}".format(
-                operator_id,
-                environ.obme_filename(postfix, operator)
-                )
-            )
-
-
-    # get filenames for static densities and extract quantum numbers
-    obdme_files = {}
-    filenames = glob.glob(os.path.join(work_dir, "mfdn.statrobdme.*"))
-    regex = re.compile(
-        # directory prefix
-        r"{}".format(os.path.join(work_dir, "")) +
-        # prolog
-        r"(?P<code>.+)\.statrobdme"
-        # sequence number
-        r"\.seq(?P<seq>\d{3})"
-        # 2J
-        r"\.2J(?P<twoJ>\d{2})"
-        # parity (v14 only)
-        r"(\.p(?P<g>\d))?"
-        # n
-        r"\.n(?P<n>\d{2})"
-        # 2T
-        r"\.2T(?P<twoT>\d{2})"
+    #   identical (operator, obme) definitions are emitted only once
+    lines += [
+        f"define-operator {operator_id:s} {environ.obme_filename(postfix, obme_id):s}"
+        for (operator_id, obme_id) in dict.fromkeys(
+            (operator_id, obme_id) for (operator_id, _, obme_id) in ob_observables
         )
-    conversions = {
-        "code": str,
-        "seq": int,
-        "twoJ": int,
-        "g": lambda x: int(x) if x is not None else 0,
-        "n": int,
-        "twoT": int
-        }
-    for filename in filenames:
-        match = regex.match(filename)
-        if match is None:
-            print(regex)
-            raise ValueError("bad statrobdme filename: {}".format(filename))
-        info = match.groupdict()
-
-        # convert fields
-        for key in info:
-            conversion = conversions[key]
-            info[key] = conversion(info[key])
-        if "g" not in info:
-            info["g"] = 0
-
-        # extract quantum numbers
-        qn = (info["twoJ"]/2., info["g"], info["n"])
-        qn_pair = (qn, qn)
-
-        obdme_files[qn_pair] = (filename, info["code"])
+        ]
+
 
+    # find density files and extract quantum numbers in a single pass over the
+    # work directory (equivalent to globs mfdn.statrobdme.* and *.robdme.*)
+    #
     # define-transition-densities 2Jf gf nf 2Ji gi fi robdme_info_filename robdme_filename
-    # get filenames for static densities and extract quantum numbers
-    filenames = glob.glob(os.path.join(work_dir, "*.robdme.*"))
-    regex = re.compile(
-        r"{}".format(os.path.join(work_dir, "")) +
-        # prolog
-        r"(?P<code>.+)\.robdme"
-        # final sequence number (MFDn only)
-        r"(\.seq(?P<seqf>\d+))?"
-        # final 2J
-        r"\.2J(?P<twoJf>\d+)"
-        # final parity (v14/postprocessor only)
-        r"(\.(p|g)(?P<gf>\d))?"
-        # final n
-        r"\.n(?P<nf>\d+)"
-        # final 2T (MFDn only)
-        r"(\.2T(?P<twoTf>\d+))?"
-        # initial sequence number (MFDn only)
-        r"(\.seq(?P<seqi>\d+))?"
-        # initial 2J
-        r"\.2J(?P<twoJi>\d+)"
-        # initial parity (v14/postprocessor only)
-        r"(\.(p|g)(?P<gi>\d))?"
-        # initial n
-        r"\.n(?P<ni>\d+)"
-        # inital 2T (MFDn only)
-        r"(\.2T(?P<twoTi>\d+))?"
-        )
-    conversions = {
-        "code": str,
-        "seqf": lambda x: int(x) if x is not None else 0,
-        "twoJf": int,
-        "gf": lambda x: int(x) if x is not None else 0,
-        "nf": int,
-        "twoTf": lambda x: int(x) if x is not None else 0,
-        "seqi": lambda x: int(x) if x is not None else 0,
-        "twoJi": int,
-        "gi": lambda x: int(x) if x is not None else 0,
-        "ni": int,
-        "twoTi": lambda x: int(x) if x is not None else 0,
-        }
-    for filename in filenames:
-        match = regex.match(filename)
-        if match is None:
-            raise ValueError("bad robdme filename: {}".format(filename))
-        info = match.groupdict()
-
-        # convert fields
-        for key in info:
-            conversion = conversions[key]
-            info[key] = conversion(info[key])
-
-        if "gf" not in info:
-            info["gf"] = 0
-        if "gi" not in info:
-            info["gi"] = 0
-
-        # extract quantum numbers
-        qn_bra = (info["twoJf"]/2., info["gf"], info["nf"])
-        qn_ket = (info["twoJi"]/2., info["gi"], info["ni"])
-        qn_pair = (qn_bra, qn_ket)
-
-        obdme_files[qn_pair] = (filename, info["code"])
-
-    # sort by sequence number of final state, then sequence number of initial state
-    for qn_pair,(filename,code) in sorted(obdme_files.items()):
-        ((J_bra, g_bra, n_bra), (J_ket, g_ket, n_ket)) = qn_pair
-        if code == "mfdn":
-            lines.append(
-                "define-densities {J_bra:4.1f} {g_bra:d} {n_bra:d}  {J_ket:4.1f} {g_ket:d} {n_ket:d} {filename:s} {info_filename:s}".format(
-                    J_bra=J_bra, g_bra=g_bra, n_bra=n_bra,
-                    J_ket=J_ket, g_ket=g_ket, n_ket=n_ket,
-                    filename=filename,
-                    info_filename=os.path.join(work_dir, "mfdn.rppobdme.info"),
-                )
-            )
-        elif code == "transitions":
-            lines.append(
-                "define-densities {J_bra:4.1f} {g_bra:d} {n_bra:d}  {J_ket:4.1f} {g_ket:d} {n_ket:d} {filename:s}".format(
-                    J_bra=J_bra, g_bra=g_bra, n_bra=n_bra,
-                    J_ket=J_ket, g_ket=g_ket, n_ket=n_ket,
-                    filename=filename,
-                )
-            )
-        else:
-            raise mcscript.exception.ScriptError("unknown density code {}".format(info["code"]))
+    static_files = {}
+    transition_files = {}
+    if os.path.isdir(work_dir):
+        with os.scandir(work_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("mfdn.statrobdme."):
+                    (code, _, twoJ, g, n, _) = parse_statrobdme_filename(name)
+                    static_files[twoJ, g, n] = (os.path.join(work_dir, name), code)
+                elif (".robdme." in name) and not name.startswith("."):
+                    (code, _, twoJf, gf, nf, _, _, twoJi, gi, ni, _) = parse_robdme_filename(name)
+                    qn_pair = ((twoJf, gf, nf), (twoJi, gi, ni))
+                    transition_files[qn_pair] = (os.path.join(work_dir, name), code)
+
+    # A transition density file for the same (bra, ket) pair as a static
+    # density file takes precedence over it, so each pair is defined only once.
+    obdme_files = dict(transition_files)
+    for (qn, static_file) in static_files.items():
+        obdme_files.setdefault((qn, qn), static_file)
+
+    # sort by quantum numbers (2J, g, n) of final state, then of initial state,
+    # so the generated input is independent of directory listing order
+    #
+    # MFDn densities additionally require the rppobdme info file.
+    info_filename = os.path.join(work_dir, "mfdn.rppobdme.info")
+    info_suffixes = {"mfdn": f" {info_filename:s}", "transitions": ""}
+    for (_, code) in obdme_files.values():
+        if code not in info_suffixes:
+            raise mcscript.exception.ScriptError("unknown density code {}".format(code))
+    lines.extend(
+        f"define-densities {twoJ_bra/2:4.1f} {g_bra:d} {n_bra:d}  {twoJ_ket/2:4.1f} {g_ket:d} {n_ket:d} {filename:s}{info_suffixes[code]:s}"
+        for (((twoJ_bra, g_bra, n_bra), (twoJ_ket, g_ket, n_ket)), (filename, code))
+        in sorted(obdme_files.items(), key=operator.itemgetter(0))
+    )
 
     # ensure trailing line
     lines.append("")
 
-    # write input file
+    # write input file (for archiving only -- obscalc-ob reads input from stdin)
     mcscript.utils.write_input(
         environ.obscalc_ob_filename(postfix),
         input_lines=lines,
         verbose=False
         )
 
-    # invoke em-gen
+    # invoke obscalc-ob
     mcscript.control.call(
         [
             environ.shell_filename("obscalc-ob")
@@ -303,18 +335,35 @@ def allowed_by_multipolarity(qn_pair, Tz_pair, operator_qn):
     (ket_J, ket_g, ket_n) = ket_qn
     (bra_Tz, ket_Tz) = Tz_pair
     (J0, g0, Tz0) = operator_qn
+    # check integer selection rules before (more costly) triangle inequality
     allowed = True
-    allowed = allowed and mfdnres.am.allowed_triangle(bra_J,J0,ket_J)
     allowed = allowed and (bra_g+ket_g+g0)%2 == 0
     # note: an operator with Tz0 can actually be used for transitions
     # with +Tz0 or -Tz0
     # allowed = allowed and (ket_Tz + Tz0) == bra_Tz
     allowed = allowed and abs(bra_Tz-ket_Tz)==abs(Tz0)
+    allowed = allowed and mfdnres.am.allowed_triangle(bra_J,J0,ket_J)
 
     return allowed
 
 
-def allowed_by_masks(task, qn_pair):
+def _normalized_mask_list(task):
+    """Get mask functions for task, as (mask_function, mask_params) pairs.
+
+    Arguments:
+        task (dict): task dictionary
+
+    Returns:
+        (list of tuple): (mask_function, mask_params) pairs
+    """
+    # wrap mask without parameters in tuple
+    return [
+        mask_function_params if isinstance(mask_function_params, tuple) else (mask_function_params, {})
+        for mask_function_params in task.get("postprocessor_mask", [])
+    ]
+
+
+def allowed_by_masks(task, qn_pair, mask_list=None, verbose=None):
     """Apply masking functions to qn_pair.
 
     Each mask function should have a declaration the form
@@ -328,24 +377,26 @@ def allowed_by_masks(task, qn_pair):
     Arguments:
         task (dict): task dictionary
         qn_pair (tuple of tuple): (qnf,qni)
+        mask_list (list of tuple, optional): (mask_function, mask_params)
+            pairs, to avoid renormalizing task masks on repeated calls
+        verbose (bool, optional): mask verbosity, to avoid rereading task
+            on repeated calls
 
     Returns:
         allowed (bool): whether or not qn pair satisfies masks
     """
 
     # extract mask configuration
-    mask_list = task.get("postprocessor_mask", [])
-    verbose = task.get("postprocessor_mask_verbose", False)
+    if mask_list is None:
+        mask_list = _normalized_mask_list(task)
+    if verbose is None:
+        verbose = task.get("postprocessor_mask_verbose", False)
 
     # apply masks
     if verbose:
         print("Mask: vetting {}".format(qn_pair))
     allowed = True
-    for mask_function_params in mask_list:
-        if not isinstance(mask_function_params, tuple):
-            # wrap mask without parameters in tuple
-            mask_function_params = (mask_function_params, {})
-        (mask_function, mask_params) = mask_function_params
+    for (mask_function, mask_params) in mask_list:
         mask_function_value = mask_function(task, mask_params, qn_pair, verbose=verbose)
         if verbose:
             print("  Mask: mask {} {}".format(mask_function.__name__, mask_function_value))
@@ -376,23 +427,37 @@ def get_run_descriptor_pair(bra_mesh_data, ket_mesh_data, qn_pair, operator_qn):
     bra_J = am.HalfInt(round(2*bra_J), 2)
     ket_J = am.HalfInt(round(2*ket_J), 2)
 
+    twice_J0 = 2*J0
+    # "diagonal" transitions must be truly diagonal, to ensure that moment
+    # phases are well defined
+    require_diagonal = (bra_qn == ket_qn) and (Tz0 == 0) and (g0 == 0)
+
+    # ket mesh points containing ket level, with 2M and M (loop invariant over bras)
+    ket_mesh_points = []
+    for ket_mesh_point in ket_mesh_data:
+        if ket_qn not in ket_mesh_point.levels:
+            continue
+        twice_ket_M = round(2*ket_mesh_point.params["M"])
+        ket_mesh_points.append((ket_mesh_point, twice_ket_M, am.HalfInt(twice_ket_M,2)))
+
     bra_run_descriptor_pair = None
     ket_run_descriptor_pair = None
     for bra_mesh_point in bra_mesh_data:
         if bra_qn not in bra_mesh_point.levels:
             continue
         # extract convenience variables
-        bra_M = am.HalfInt(round(2*bra_mesh_point.params["M"]),2)
+        twice_bra_M = round(2*bra_mesh_point.params["M"])
+        bra_M = am.HalfInt(twice_bra_M,2)
 
-        for ket_mesh_point in ket_mesh_data:
+        for (ket_mesh_point, twice_ket_M, ket_M) in ket_mesh_points:
             # special case: ensure that "diagonal" transitions are always
-            # truly diagonal, to ensure that moment phases are well defined
-            if (bra_qn == ket_qn) and (Tz0 == 0) and (g0 == 0):
-                if ket_mesh_point != bra_mesh_point:
-                    continue
-            if ket_qn not in ket_mesh_point.levels:
+            # truly diagonal
+            if require_diagonal and (ket_mesh_point != bra_mesh_point):
+                continue
+
+            # skip trivially vanishing Clebsch (operator M out of range)
+            if abs(twice_ket_M-twice_bra_M) > twice_J0:
                 continue
-            ket_M = am.HalfInt(round(2*ket_mesh_point.params["M"]),2)
 
             # check for Clebsch zero
             cg_coefficient = am.ClebschGordan(
@@ -448,11 +513,14 @@ def init_postprocessor_db(task, postfix=""):
 
     # populate operator information
     tb_observables_by_qn = operators.tb.get_tbme_targets(task)
-    for operator_qn in tb_observables_by_qn:
-        db.executemany(
-            "INSERT INTO tb_operators VALUES (?,?,?,?)",
-            [(operator_name, *operator_qn) for operator_name in tb_observables_by_qn[operator_qn]]
-        )
+    db.executemany(
+        "INSERT INTO tb_operators VALUES (?,?,?,?)",
+        [
+            (operator_name, *operator_qn)
+            for (operator_qn, operator_names) in tb_observables_by_qn.items()
+            for operator_name in operator_names
+        ]
+    )
     db.commit()
 
     ################################################################
@@ -503,7 +571,7 @@ def init_postprocessor_db(task, postfix=""):
         relax_canonicalization = task.get("postprocessor_relax_canonicalization", False)
         reverse_canonicalization = task.get("postprocessor_reverse_canonicalization", False)
         canonicalize = not relax_canonicalization
-        ket_mesh_data = bra_mesh_data[:]
+        ket_mesh_data = bra_mesh_data  # shared, read-only below
         ket_merged_data = bra_merged_data
     else:
         canonicalize = False
@@ -565,23 +633,39 @@ def init_postprocessor_db(task, postfix=""):
     ################################################################
     # populate level tables
     ################################################################
+    bra_id_dict = {
+        (J,g,n): level_id
+        for (level_id, (J,g,n)) in enumerate(
+            ((J,g,n) for (J,g,n) in bra_merged_data.levels if abs(round(2*J)-2*J)<=0.1),
+            start=1
+        )
+    }
     db.executemany(
-        "INSERT INTO bra_levels (bra_J,bra_g,bra_n) VALUES (?,?,?)",
-        [(J,g,n) for (J,g,n) in bra_merged_data.levels if abs(round(2*J)-2*J)<=0.1]
+        "INSERT INTO bra_levels (bra_level_id,bra_J,bra_g,bra_n) VALUES (?,?,?,?)",
+        [(level_id, *qn) for (qn, level_id) in bra_id_dict.items()]
     )
-    bra_id_list = db.execute(
-        "SELECT bra_J,bra_g,bra_n,bra_level_id FROM bra_levels"
-        )
-    bra_id_dict = {(J,g,n): level_id for (J,g,n,level_id) in bra_id_list}
 
+    ket_id_dict = {
+        (J,g,n): level_id
+        for (level_id, (J,g,n)) in enumerate(
+            ((J,g,n) for (J,g,n) in ket_merged_data.levels if abs(round(2*J)-2*J)<=0.1),
+            start=1
+        )
+    }
     db.executemany(
-        "INSERT INTO ket_levels (ket_J,ket_g,ket_n) VALUES (?,?,?)",
-        [(J,g,n) for (J,g,n) in ket_merged_data.levels if abs(round(2*J)-2*J)<=0.1]
+        "INSERT INTO ket_levels (ket_level_id,ket_J,ket_g,ket_n) VALUES (?,?,?,?)",
+        [(level_id, *qn) for (qn, level_id) in ket_id_dict.items()]
     )
-    ket_id_list = db.execute(
-        "SELECT ket_J,ket_g,ket_n,ket_level_id FROM ket_levels"
-        )
-    ket_id_dict = {(J,g,n): level_id for (J,g,n,level_id) in ket_id_list}
+
+    # masks (normalized once for all pairs)
+    mask_list = _normalized_mask_list(task)
+    mask_verbose = task.get("postprocessor_mask_verbose", False)
+
+    # caches shared by two-body and one-body tables
+    #   mask results depend only on (bra,ket) pair, not on the operator
+    #   run/descriptor pairs depend only on quantum numbers, since meshes are fixed
+    mask_results = {}
+    run_descriptor_pairs = {}
 
     ################################################################
     # create two-body transitions table
@@ -608,14 +692,24 @@ def init_postprocessor_db(task, postfix=""):
             CONSTRAINT uniq UNIQUE (bra_level_id, ket_level_id, operator_id)
         );"""
     )
+    # partial index over pending transitions, for work selection queries
+    db.execute(
+        """CREATE INDEX tb_transitions_pending
+        ON tb_transitions (operator_id, bra_run, bra_descriptor, bra_level_id)
+        WHERE rme IS NULL;"""
+    )
 
     ################################################################
     # populate two-body transitions table
     ################################################################
     # construct list of (bra,ket,tbo) tuples
+    #   isospin selection depends only on the operator, since bra and ket
+    #   nuclides are fixed, so screen operators before forming product
     bra_ket_tbo_product = itertools.product(
-        bra_id_dict.keys(), ket_id_dict.keys(), tb_observables_by_qn.keys()
+        bra_id_dict.keys(), ket_id_dict.keys(),
+        [operator_qn for operator_qn in tb_observables_by_qn if abs(bra_Tz-ket_Tz)==abs(operator_qn[2])]
         )
+    tb_rows = []
     for (bra_qn, ket_qn, operator_qn) in bra_ket_tbo_product:
         # check canonical order
         if canonicalize and (
@@ -626,22 +720,29 @@ def init_postprocessor_db(task, postfix=""):
         # apply masks
         if not allowed_by_multipolarity((bra_qn,ket_qn), (bra_Tz,ket_Tz), operator_qn):
             continue
-        if not allowed_by_masks(task, (bra_qn,ket_qn)):
+        if (bra_qn,ket_qn) not in mask_results:
+            mask_results[bra_qn,ket_qn] = allowed_by_masks(task, (bra_qn,ket_qn), mask_list, mask_verbose)
+        if not mask_results[bra_qn,ket_qn]:
             continue
 
-        (bra_run_descriptor_pair, ket_run_descriptor_pair) = get_run_descriptor_pair(
-            bra_mesh_data, ket_mesh_data, (bra_qn, ket_qn), operator_qn
-            )
+        run_descriptor_key = (bra_qn, ket_qn, operator_qn)
+        if run_descriptor_key not in run_descriptor_pairs:
+            run_descriptor_pairs[run_descriptor_key] = get_run_descriptor_pair(
+                bra_mesh_data, ket_mesh_data, (bra_qn, ket_qn), operator_qn
+                )
+        (bra_run_descriptor_pair, ket_run_descriptor_pair) = run_descriptor_pairs[run_descriptor_key]
         if (bra_run_descriptor_pair is None) or (ket_run_descriptor_pair is None):
             continue
-        db.executemany(
-            "INSERT INTO tb_transitions VALUES (?,?,?, ?,?,?, ?, NULL)",
-            [
-                (*bra_run_descriptor_pair, bra_id_dict[bra_qn],
-                *ket_run_descriptor_pair, ket_id_dict[ket_qn],
-                operator_name)
-                for operator_name in tb_observables_by_qn[operator_qn]]
-            )
+        tb_rows += [
+            (*bra_run_descriptor_pair, bra_id_dict[bra_qn],
+            *ket_run_descriptor_pair, ket_id_dict[ket_qn],
+            operator_name)
+            for operator_name in tb_observables_by_qn[operator_qn]
+            ]
+    db.executemany(
+        "INSERT INTO tb_transitions VALUES (?,?,?, ?,?,?, ?, NULL)",
+        tb_rows
+        )
     db.commit()
 
     ################################################################
@@ -668,6 +769,11 @@ def init_postprocessor_db(task, postfix=""):
                 )
         );"""
     )
+    db.execute(
+        """CREATE INDEX ob_transitions_pending
+        ON ob_transitions (bra_run, bra_descriptor, bra_level_id)
+        WHERE finished IS NULL;"""
+    )
 
     ################################################################
     # populate one-body transitions table
@@ -675,10 +781,12 @@ def init_postprocessor_db(task, postfix=""):
     # construct list of (bra,ket,ob_qn) tuples
     ob_observables = operators.ob.generate_ob_observable_sets(task)[0]
     ob_observables += task.get("ob_observables", [])
+    #   screen operators by isospin selection before forming product (see above)
     bra_ket_ob_qn_product = itertools.product(
         bra_id_dict.keys(), ket_id_dict.keys(),
-        {operator_qn for (_,operator_qn,_) in ob_observables}
+        {operator_qn for (_,operator_qn,_) in ob_observables if abs(bra_Tz-ket_Tz)==abs(operator_qn[2])}
     )
+    ob_rows = []
     for (bra_qn, ket_qn, operator_qn) in bra_ket_ob_qn_product:
         # check canonical order
         if canonicalize and (
@@ -689,19 +797,27 @@ def init_postprocessor_db(task, postfix=""):
         # apply masks
         if not allowed_by_multipolarity((bra_qn,ket_qn), (bra_Tz,ket_Tz), operator_qn):
             continue
-        if not allowed_by_masks(task, (bra_qn,ket_qn)):
+        if (bra_qn,ket_qn) not in mask_results:
+            mask_results[bra_qn,ket_qn] = allowed_by_masks(task, (bra_qn,ket_qn), mask_list, mask_verbose)
+        if not mask_results[bra_qn,ket_qn]:
             continue
 
-        (bra_run_descriptor_pair, ket_run_descriptor_pair) = get_run_descriptor_pair(
-            bra_mesh_data, ket_mesh_data, (bra_qn, ket_qn), operator_qn
-            )
+        run_descriptor_key = (bra_qn, ket_qn, operator_qn)
+        if run_descriptor_key not in run_descriptor_pairs:
+            run_descriptor_pairs[run_descriptor_key] = get_run_descriptor_pair(
+                bra_mesh_data, ket_mesh_data, (bra_qn, ket_qn), operator_qn
+                )
+        (bra_run_descriptor_pair, ket_run_descriptor_pair) = run_descriptor_pairs[run_descriptor_key]
         if (bra_run_descriptor_pair is None) or (ket_run_descriptor_pair is None):
             continue
-        db.execute(
-            "INSERT OR IGNORE INTO ob_transitions VALUES (?,?,?, ?,?,?, NULL)",
+        ob_rows.append(
             (*bra_run_descriptor_pair, bra_id_dict[bra_qn],
             *ket_run_descriptor_pair, ket_id_dict[ket_qn])
             )
+    db.executemany(
+        "INSERT OR IGNORE INTO ob_transitions VALUES (?,?,?, ?,?,?, NULL)",
+        ob_rows
+        )
     db.commit()
 
 
@@ -764,6 +880,26 @@ def parse_two_body_observable(res, tokenized_lines):
         transition_dict[(qnf,qni)] = rme
 
 
+def _link_or_copy(src, dst):
+    """Save copy of file, as hard link if possible.
+
+    Linking is safe for transitions output, since old output is removed (not
+    truncated) before each transitions run.
+
+    Arguments:
+        src (str): source filename
+        dst (str): destination filename (replaced if it exists)
+    """
+    print("{} -> {}".format(src, dst))
+    try:
+        if os.path.lexists(dst):
+            os.remove(dst)
+        os.link(src, dst)
+    except OSError:
+        # e.g., cross-device link or filesystem without hard links
+        shutil.copyfile(src, dst)
+
+
 def parse_transitions_results(in_file, verbose=False):
     """Parse transitions results file.
 
@@ -810,6 +946,9 @@ def run_postprocessor_two_body(task, postfix="", one_body=False):
     )
     ob_observables = operators.ob.generate_ob_observable_sets(task)[0]
     ob_observables += task.get("ob_observables", [])
+    #   maximum one-body operator rank (None if there are no one-body
+    #   observables, in which case there are also no one-body transitions)
+    max_J0 = max(J0 for _,(J0,_,_),_ in ob_observables) if ob_observables else None
 
     # create work directory if it doesn't exist yet
     mcscript.utils.mkdir(work_dir, exist_ok=True, parents=True)
@@ -838,11 +977,13 @@ def run_postprocessor_two_body(task, postfix="", one_body=False):
     # begin master loop for two-body operators
     ################################################################
     timer = mcscript.utils.TaskTimer(remaining_time=mcscript.parameters.run.get_remaining_time())
-    while db.execute("SELECT * FROM `tb_transitions` WHERE rme is NULL;").fetchone():
-        # print status message
+    while True:
+        # print status message (or finish if nothing remains)
         (incomplete_count,) = db.execute(
             "SELECT COUNT(*) FROM `tb_transitions` WHERE rme is NULL;"
         ).fetchone()
+        if incomplete_count == 0:
+            break
         print("-"*64)
         print("Remaining two-body transitions: {:d}/{:d}".format(incomplete_count, total_count))
         print("-"*64)
@@ -943,7 +1084,6 @@ def run_postprocessor_two_body(task, postfix="", one_body=False):
         min_ket_J = min([ket_J for (ket_J,_,_) in ket_qn_list])
         max_deltaJ = max(abs(max_ket_J-bra_J), max_ket_J+bra_J, abs(min_ket_J-bra_J), min_ket_J+bra_J)
         if num_free_obdmes > 0:
-            max_J0 = max([J0 for _,(J0,_,_),_ in ob_observables])
             max2K = 2*int(min(max_deltaJ, max_J0))
         else:
             max2K = 0
@@ -1027,14 +1167,14 @@ def run_postprocessor_two_body(task, postfix="", one_body=False):
                 mcscript.parameters.run.name, descriptor, postfix, group_hash, "out"
             )
         )
-        mcscript.control.call(["cp", "--verbose", "transitions.out", out_filename])
+        _link_or_copy("transitions.out", out_filename)
         res_filename = os.path.join(
             transitions_output_dir,
             filename_template.format(
                 mcscript.parameters.run.name, descriptor, postfix, group_hash, "res"
             )
         )
-        mcscript.control.call(["cp", "--verbose", "transitions.res", res_filename])
+        _link_or_copy("transitions.res", res_filename)
         timer.stop_timer()
 
         # return to task directory
@@ -1058,7 +1198,7 @@ def run_postprocessor_two_body(task, postfix="", one_body=False):
     for (J0, g0, Tz0, operator_id) in cursor:
         lines += ["[Two-body observable]"]
         lines += ["# {:>3s} {:>3s} {:>3s}  {:s}".format("J0", "g0", "Tz0", "name")]
-        lines += ["  {:>3d} {:>3d} {:>3d}  {:s}".format(J0, g0, Tz0, operator_id)]
+        lines += [f"  {J0:>3d} {g0:>3d} {Tz0:>3d}  {operator_id:s}"]
         data = db.execute("""
             SELECT bra_J, bra_g, bra_n, ket_J, ket_g, ket_n, rme
             FROM tb_transitions
@@ -1074,8 +1214,10 @@ def run_postprocessor_two_body(task, postfix="", one_body=False):
             "Jf", "gf", "nf", "Ji", "gi", "ni", "rme"
             )
         ]
-        for row in data:
-            lines += ["  {bra_J:>4.1f} {bra_g:>3d} {bra_n:>3d}  {ket_J:>4.1f} {ket_g:>3d} {ket_n:>3d}  {rme:15.8e}".format(**row)]
+        lines.extend(
+            f"  {bra_J:>4.1f} {bra_g:>3d} {bra_n:>3d}  {ket_J:>4.1f} {ket_g:>3d} {ket_n:>3d}  {rme:15.8e}"
+            for (bra_J, bra_g, bra_n, ket_J, ket_g, ket_n, rme) in data
+        )
         lines += [""]
     mcscript.utils.write_input(res_filename, lines, verbose=False)
 
@@ -1197,7 +1339,7 @@ def dry_run_postprocessor(postfix="", one_body=False):
     # do two-body dry run
     run_count = 0
     print("Dry run of two-body transitions")
-    while db.execute("SELECT * FROM `tb_transitions` WHERE rme is NULL;").fetchone():
+    while db.execute("SELECT 1 FROM `tb_transitions` WHERE rme is NULL LIMIT 1;").fetchone():
         # get operator quantum numbers
         operator_qn = db.execute(
             """SELECT `J0`,`g0`,`Tz0`
@@ -1350,7 +1492,7 @@ def dry_run_postprocessor(postfix="", one_body=False):
     # do one-body dry run
     run_count = 0
     print("Dry run of one-body transitions")
-    while db.execute("SELECT * FROM `ob_transitions` WHERE finished is NULL;").fetchone():
+    while db.execute("SELECT 1 FROM `ob_transitions` WHERE finished is NULL LIMIT 1;").fetchone():
         # get bra wavefunction specifier
         (bra_run, bra_descriptor, bra_level_id, bra_J, bra_g, bra_n) = db.execute(
             """SELECT bra_run, bra_descriptor, bra_level_id, bra_J, bra_g, bra_n
@@ -1425,6 +1567,9 @@ def run_postprocessor_one_body(task, postfix=""):
     )
     ob_observables = operators.ob.generate_ob_observable_sets(task)[0]
     ob_observables += task.get("ob_observables", [])
+    #   maximum one-body operator rank (None if there are no one-body
+    #   observables, in which case there are also no one-body transitions)
+    max_J0 = max(J0 for _,(J0,_,_),_ in ob_observables) if ob_observables else None
 
     # create work directory if it doesn't exist yet
     mcscript.utils.mkdir(work_dir, exist_ok=True, parents=True)
@@ -1444,11 +1589,13 @@ def run_postprocessor_one_body(task, postfix=""):
     # begin master loop for one-body operators
     ################################################################
     timer = mcscript.utils.TaskTimer(remaining_time=mcscript.parameters.run.get_remaining_time())
-    while db.execute("SELECT * FROM `ob_transitions` WHERE finished is NULL;").fetchone():
-        # print status message
+    while True:
+        # print status message (or finish if nothing remains)
         (incomplete_count,) = db.execute(
             "SELECT COUNT(*) FROM `ob_transitions` WHERE finished is NULL;"
         ).fetchone()
+        if incomplete_count == 0:
+            break
         print("-"*64)
         print("Remaining one-body transitions: {:d}/{:d}".format(incomplete_count, total_count))
         print("-"*64)
@@ -1505,7 +1652,6 @@ def run_postprocessor_one_body(task, postfix=""):
         max_ket_J = max([ket_J for (ket_J,_,_) in ket_qn_list])
         min_ket_J = min([ket_J for (ket_J,_,_) in ket_qn_list])
         max_deltaJ = max(abs(max_ket_J-bra_J), max_ket_J+bra_J, abs(min_ket_J-bra_J), min_ket_J+bra_J)
-        max_J0 = max([J0 for _,(J0,_,_),_ in ob_observables])
         max2K = 2*int(min(max_deltaJ, max_J0))
         transitions_inputlist = {
             "basisfilename_bra": "{:s}/mfdn_MBgroups".format(bra_wf_prefix),
@@ -1560,14 +1706,14 @@ def run_postprocessor_one_body(task, postfix=""):
                 mcscript.parameters.run.name, descriptor, postfix, group_hash, "out"
             )
         )
-        mcscript.control.call(["cp", "--verbose", "transitions.out", out_filename])
+        _link_or_copy("transitions.out", out_filename)
         res_filename = os.path.join(
             transitions_output_dir,
             filename_template.format(
                 mcscript.parameters.run.name, descriptor, postfix, group_hash, "res"
             )
         )
-        mcscript.control.call(["cp", "--verbose", "transitions.res", res_filename])
+        _link_or_copy("transitions.res", res_filename)
         timer.stop_timer()
 
         # return to task directory
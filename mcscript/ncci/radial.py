@@ -78,7 +78,7 @@ def set_up_interaction_orbitals(task, postfix=""):
             environ.shell_filename("orbital-gen"),
             "--Nmax",
             "{truncation_int[1]:d}".format(**task),
-            "{:s}".format(environ.orbitals_int_filename(postfix))
+            environ.orbitals_int_filename(postfix)
         ],
         mode=mcscript.control.CallMode.kSerial
     )
@@ -88,7 +88,7 @@ def set_up_interaction_orbitals(task, postfix=""):
                 environ.shell_filename("orbital-gen"),
                 "--Nmax",
                 "{truncation_coul[1]:d}".format(**task),
-                "{:s}".format(environ.orbitals_coul_filename(postfix))
+                environ.orbitals_coul_filename(postfix)
             ],
             mode=mcscript.control.CallMode.kSerial
         )
@@ -148,7 +148,7 @@ def set_up_orbitals_Nmax(task, postfix=""):
             environ.shell_filename("orbital-gen"),
             "--Nmax",
             "{Nmax_orb:d}".format(Nmax_orb=Nmax_orb),
-            "{:s}".format(environ.orbitals_filename(postfix))
+            environ.orbitals_filename(postfix)
         ],
         mode=mcscript.control.CallMode.kSerial
     )
@@ -174,7 +174,7 @@ def set_up_orbitals_triangular(task, postfix=""):
             "{sp_weight_max:f}".format(**truncation_parameters),
             "{n_coeff:f}".format(**truncation_parameters),
             "{l_coeff:f}".format(**truncation_parameters),
-            "{:s}".format(environ.orbitals_filename(postfix))
+            environ.orbitals_filename(postfix)
         ],
         mode=mcscript.control.CallMode.kSerial
     )
@@ -317,10 +317,10 @@ def set_up_obme_analytic(task, postfix=""):
         else:
             raise mcscript.exception.ScriptError("unknown one-body operator {}".format(identifier))
 
-    for identifier in sorted(obme_targets):
-        lines += ["define-target {id:s} {filename:s}".format(
-            id=identifier, filename=environ.obme_filename(postfix, identifier)
-        )]
+    lines.extend(
+        f"define-target {identifier:s} {environ.obme_filename(postfix, identifier):s}"
+        for identifier in sorted(obme_targets)
+    )
 
     # # set up radial matrix elements for observables
     # lines += set_up_observable_radial_analytic(task, postfix)
@@ -491,9 +491,6 @@ def set_up_radial_natorb(task, source_postfix, target_postfix):
     basis_command = "set-basis {basis_type:s} {orbital_filename:s}"
     length_command = "set-length-parameter {length_parameter:.17e}"
     xform_command = "define-xform natorb {xform_filename:s}"
-    input_source_command = "define-source input {id:s}{source_postfix:s} {filename:s} {J0:d} {g0:d} {Tz0:d}"
-    xform_source_command = "define-source xform {id:s}{target_postfix:s} {id:s}{source_postfix:s} natorb"
-    target_command = "define-target {id:s}{target_postfix:s} {filename:s}"
 
     # get obme sources
     obme_targets = operators.ob.get_obme_targets_obmixer(task)
@@ -512,18 +509,13 @@ def set_up_radial_natorb(task, source_postfix, target_postfix):
 
     for identifier in sorted(obme_targets):
         (J0, g0, Tz0) = obme_sources[identifier]["qn"]
-        lines += [input_source_command.format(
-            id=identifier, source_postfix=source_postfix, target_postfix=target_postfix,
-            filename=environ.obme_filename(source_postfix, identifier),
-            J0=J0, g0=g0, Tz0=Tz0
-        )]
-        lines += [xform_source_command.format(
-            id=identifier, source_postfix=source_postfix, target_postfix=target_postfix,
-        )]
-        lines += [target_command.format(
-            id=identifier, source_postfix=source_postfix, target_postfix=target_postfix,
-            filename=environ.obme_filename(target_postfix, identifier)
-        )]
+        source_id = f"{identifier:s}{source_postfix:s}"
+        target_id = f"{identifier:s}{target_postfix:s}"
+        lines += [
+            f"define-source input {source_id:s} {environ.obme_filename(source_postfix, identifier):s} {J0:d} {g0:d} {Tz0:d}",
+            f"define-source xform {target_id:s} {source_id:s} natorb",
+            f"define-target {target_id:s} {environ.obme_filename(target_postfix, identifier):s}",
+        ]
 
     # call obmixer
     mcscript.control.call(
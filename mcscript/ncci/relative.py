@@ -37,7 +37,7 @@ def relative_filename_for_source(source_id:str, source:dict) -> str:
         (str): filename for relative/relative-cm source
     """
     # if the source is a file, find it on the filesystem
-    if source["source_type"] == "file":
+    if source["source_type"] == operators.rel.k_source_type_file:
         filename = source.get("parameters", {}).get("filename")
         if filename is not None:
             rel_filename = mcscript.utils.expand_path(filename)
@@ -61,7 +61,7 @@ def relative_filename_for_source(source_id:str, source:dict) -> str:
 
     return rel_filename
 
-_k_rel_target_handlers["file"] = (
+_k_rel_target_handlers[operators.rel.k_source_type_file] = (
     lambda source_id, sources: relative_filename_for_source(source_id, sources[source_id])
 )
 
@@ -94,7 +94,7 @@ def _jpv2rel_handler(source_id:str, rel_sources:dict):
 
     return rel_filename
 
-_k_rel_target_handlers["jpv"] = _jpv2rel_handler
+_k_rel_target_handlers[operators.rel.k_source_type_jpv] = _jpv2rel_handler
 
 _k_relativegen_operator_patterns = {
     "coordinate-sqr": " {coordinate_type:s} {T0:d}",
@@ -134,8 +134,8 @@ def _relativegen_handler(source_id:str, rel_sources:dict):
 
     return rel_filename
 
-_k_rel_target_handlers["relative-gen"] = _relativegen_handler
-_k_rel_target_handlers["relcm-gen"] = _relativegen_handler
+_k_rel_target_handlers[operators.rel.k_source_type_relative_gen] = _relativegen_handler
+_k_rel_target_handlers[operators.rel.k_source_type_relcm_gen] = _relativegen_handler
 
 
 def _relativexform_handler(source_id:str, rel_sources:dict):
@@ -174,7 +174,7 @@ def _relativexform_handler(source_id:str, rel_sources:dict):
 
     return rel_filename
 
-_k_rel_target_handlers["relative-xform"] = _relativexform_handler
+_k_rel_target_handlers[operators.rel.k_source_type_relative_xform] = _relativexform_handler
 
 
 def generate_rel_targets(task):
@@ -224,7 +224,7 @@ def generate_moshinsky_targets(task):
 
         lines = []
         lines += ["{:s} {:d}".format(*truncation)]
-        lines += [f"{rel_filename:s} {relative_source['type'].value:s}"]
+        lines += [f"{rel_filename:s} {operators.rel.RelativeOperatorType(relative_source['type']).value:s}"]
         lines += [f"{tbme_filename:s} jjjpn {task['h2_format']} {Tz0:d}"]
         lines += [""]
 
@@ -217,8 +217,7 @@ def generate_tbme_targets(task, targets, target_qn, postfix=""):
         A = sum(nuclide)
 
     # get set of required sources
-    required_tbme_sources = set()
-    required_tbme_sources.update(*[op.keys() for op in targets.values()])
+    required_tbme_sources = set().union(*(op.keys() for op in targets.values()))
 
     # get tbme sources
     tbme_sources = operators.tb.get_tbme_sources(task, targets, postfix)
@@ -286,7 +285,7 @@ def generate_tbme_targets(task, targets, target_qn, postfix=""):
 
     # xform sources: collect unique filenames
     xform_filename_set = set()
-    for source_id in sorted(required_tbme_sources & set(tbme_sources.keys())):
+    for source_id in sorted(required_tbme_sources & tbme_sources.keys()):
         xform_filename = tbme_sources[source_id].get("xform_filename")
         xform_truncation = tbme_sources[source_id].get("xform_truncation")
         if (xform_filename is not None) and (xform_truncation is not None):
@@ -14,6 +14,7 @@
     - 07/05/24 (mac): Add partition_filename().
 """
 
+import functools
 import math
 import os
 
@@ -81,11 +82,15 @@ def natural_orbital_indicator(natural_orbital_iteration):
 # oscillator length calculations
 ################################################################
 
+@functools.lru_cache(maxsize=128)
 def oscillator_length(hw):
     """Calculate oscillator length for given oscillator frequency.
 
     b(hw) = (hbar c)/[(m_N c^2) (hbar omega)]^(1/2)
 
+    Results are memoized, since the same few hw values are requested
+    repeatedly while setting up operators for a run.
+
     Arguments:
         hw (numeric): hbar omega in MeV
 